@@ -0,0 +1,816 @@
+# -*- coding: utf-8 -*-
+"""
+AmenityMapping.py
+
+Description: This is a Python module that maps OpenStreetMap amenities in
+GeoJSON files onto the City Digital Twin ontologies. It replaces the programs
+that each mapped one category (School.py, Clinic.py, Parks2.py, etc.) with
+one mapping specification per category and a single engine that compiles a
+specification into a function generating the triples of one feature.
+
+Each specification lists the schema triples of the category, the GeoJSON
+files it is read from, the class of its instances, and a table from each
+optional OpenStreetMap tag to the predicate it is mapped onto. The tags of a
+feature are looked up in the table, so only the tags the feature has are
+visited and no exception is raised for a missing tag.
+
+"""
+
+# Import modules
+import re
+import rdflib
+import usaddress
+import phonenumbers
+
+from rdflib import Literal, RDF
+
+from Indicators import filter_matches
+
+# Declare namespaces
+toronto = rdflib.Namespace('http://ontology.eil.utoronto.ca/Toronto/Toronto#')
+genprop = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-1/ed-1/en/ontology/GenericProperties/')
+cdt = rdflib.Namespace('http://ontology.eil.utoronto.ca/CDT#')
+gcir = rdflib.Namespace('http://ontology.eil.utoronto.ca/GCI/Recreation/GCIRecreation.owl#')
+loc = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-1/ed-1/en/ontology/SpatialLoc/')
+geo = rdflib.Namespace('http://www.opengis.net/ont/geosparql#')
+gci = rdflib.Namespace('http://ontology.eil.utoronto.ca/GCI/Foundation/GCI-Foundation.owl#')
+code = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-2/ed-1/en/ontology/Code/')
+gcie = rdflib.Namespace('http://ontology.eil.utoronto.ca/GCI/Education/GCI-Education.owl#')
+rdfs = rdflib.Namespace('http://www.w3.org/2000/01/rdf-schema#')
+sc = rdflib.Namespace('http://schema.org/')
+gcih = rdflib.Namespace('http://ontology.eil.utoronto.ca/GCI/Health/GCI-Health.owl#')
+contact = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-2/ed-1/en/ontology/Contact/')
+cityunits = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-1/ed-1/en/ontology/CityUnits/')
+iso21972 = rdflib.Namespace('http://ontology.eil.utoronto.ca/ISO21972/iso21972#')
+
+# Non-digit characters stripped from the OpenStreetMap id, e.g. "way/26594773"
+nondigits = re.compile("[^0-9]")
+
+# School classes for each operator:type, and for each ISCED level in isced:level
+schoolclasses = {
+    "public": (gcie.PublicSchool, [("1", gcie.PublicPrimarySchool),
+                                   ("2", gcie.PublicMiddleSchool),
+                                   ("3", gcie.PublicSecondarySchool)]),
+    "private": (gcie.PrivateSchool, [("1", gcie.PrivatePrimarySchool),
+                                     ("2", gcie.PrivateMiddleSchool),
+                                     ("3", gcie.PrivateSecondarySchool)]),
+}
+
+
+def school_classes(tags):
+    """
+    Assigns the school type based on the operator type and ISCED level.
+
+    Parameters:
+    tags (dict): The OpenStreetMap tags of the school.
+
+    Returns:
+    list: The (predicate, object) pairs of the school instance.
+    """
+
+    if "operator:type" not in tags:
+        return [(RDF.type, gcie.School)]
+
+    ownership = tags["operator:type"]
+    if ownership not in schoolclasses:
+        return []
+
+    schoolclass, levelclasses = schoolclasses[ownership]
+    pairs = [(gcie.hasOwnership, Literal(ownership))]
+    if "isced:level" not in tags:
+        pairs.append((RDF.type, schoolclass))
+    else:
+        pairs.extend((RDF.type, levelclass) for level, levelclass in levelclasses if level in tags["isced:level"])
+
+    return pairs
+
+
+def hospital_classes(tags):
+    """
+    Assigns the hospital type based on the operator type.
+
+    Parameters:
+    tags (dict): The OpenStreetMap tags of the hospital.
+
+    Returns:
+    list: The (predicate, object) pairs of the hospital instance.
+    """
+
+    if "operator:type" not in tags:
+        return [(RDF.type, sc.Hospital)]
+
+    operatortype = tags["operator:type"]
+    pairs = [(cdt.operatorType, Literal(operatortype))]
+    if "public" in operatortype:
+        pairs.append((RDF.type, gcih.PublicHospital))
+    if "private" in operatortype:
+        pairs.append((RDF.type, gcih.PrivateHospital))
+
+    return pairs
+
+
+# Mapping specification of each amenity category. sources maps each GeoJSON
+# file to the filters its features must satisfy, in the format of the amenities
+# dictionary of Indicators.py, or None to map every feature. The instance of a
+# feature is named by its OpenStreetMap id followed by instance, and has the
+# types in classes plus the pairs returned by classrule, if any. properties
+# maps each optional tag onto the predicate of its literal, phones lists the
+# (tag, node suffix, phone type) of each telephone number, area adds the
+# surface area of the feature, and the triples are written to output.
+mappings = {
+    "School": {
+        "sources": {"school.geojson": None},
+        "instance": "School",
+        "classes": [],
+        "classrule": school_classes,
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "school:language": cdt.languageOfInstruction,
+            "religion": cdt.religion,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone),
+                   ("fax", "Faxphone", contact.faxPhone)],
+        "schema": [
+            (gcie.PublicPrimarySchool, code.hasCode, cdt.level1ISCEDCode),
+            (gcie.PublicPrimarySchool, gcie.delivers_Program, gcie.GradeLevelPrimaryOntario),
+            (gcie.PrivatePrimarySchool, code.hasCode, cdt.level1ISCEDCode),
+            (gcie.PrivatePrimarySchool, gcie.delivers_Program, gcie.GradeLevelPrimaryOntario),
+            (gcie.GradeLevelPrimaryOntario, gcie.starting_Grade, gcie.GradeOne),
+            (gcie.GradeLevelPrimaryOntario, gcie.ending_Grade, gcie.GradeSix),
+            (gcie.PublicMiddleSchool, code.hasCode, cdt.level2ISCEDCode),
+            (gcie.PublicMiddleSchool, gcie.delivers_Program, gcie.GradeLevelMiddleOntario),
+            (gcie.PrivateMiddleSchool, code.hasCode, cdt.level2ISCEDCode),
+            (gcie.PrivateMiddleSchool, gcie.delivers_Program, gcie.GradeLevelMiddleOntario),
+            (gcie.GradeLevelMiddleOntario, gcie.starting_Grade, gcie.GradeSeven),
+            (gcie.GradeLevelMiddleOntario, gcie.ending_Grade, gcie.GradeEight),
+            (gcie.PublicSecondarySchool, code.hasCode, cdt.level3ISCEDCode),
+            (gcie.PublicSecondarySchool, gcie.delivers_Program, gcie.GradeLevelSecondaryOntario),
+            (gcie.PrivateSecondarySchool, code.hasCode, cdt.level3ISCEDCode),
+            (gcie.PrivateSecondarySchool, gcie.delivers_Program, gcie.GradeLevelSecondaryOntario),
+            (gcie.GradeLevelSecondaryOntario, gcie.starting_Grade, gcie.GradeNine),
+            (gcie.GradeLevelSecondaryOntario, gcie.ending_Grade, gcie.GradeTwelve),
+            (cdt.ISCEDCode, rdfs.subClassOf, code.Code),
+            (cdt.level1ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level2ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level3ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level1ISCEDCode, genprop.hasName, Literal("1 Primary Education")),
+            (cdt.level1ISCEDCode, genprop.hasDescription, Literal("Programmes typically designed to provide students with fundamental skills in reading, writing and mathematics and to establish a solid foundation for learning.")),
+            (cdt.level2ISCEDCode, genprop.hasName, Literal("2 Lower Secondary Education")),
+            (cdt.level2ISCEDCode, genprop.hasDescription, Literal("First stage of secondary education building on primary education, typically with a more subject-oriented curriculum.")),
+            (cdt.level3ISCEDCode, genprop.hasName, Literal("3 Upper Secondary Education")),
+            (cdt.level3ISCEDCode, genprop.hasDescription, Literal("Second/final stage of secondary education preparing for tertiary education or providing skills relevant to employment. Usually with an increased range of subject options and streams.")),
+            (gcie.PublicPrimarySchool, rdfs.subClassOf, gcie.PublicSchool),
+            (gcie.PublicMiddleSchool, rdfs.subClassOf, gcie.PublicSchool),
+            (gcie.PublicSecondarySchool, rdfs.subClassOf, gcie.PublicSchool),
+            (gcie.PrivatePrimarySchool, rdfs.subClassOf, gcie.PrivateSchool),
+            (gcie.PrivateMiddleSchool, rdfs.subClassOf, gcie.PrivateSchool),
+            (gcie.PrivateSecondarySchool, rdfs.subClassOf, gcie.PrivateSchool),
+            (gcie.PublicSchool, rdfs.subClassOf, gcie.School),
+            (gcie.PrivateSchool, rdfs.subClassOf, gcie.School),
+            (contact.workPhone, RDF.type, contact.PhoneType),
+            (contact.faxPhone, RDF.type, contact.PhoneType),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (gcie.School, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (gcie.School, cdt.displayColor, Literal("#4287f5")),
+            # Generate triples for displayProperties
+            (gcie.School, cdt.displayProperties, genprop.hasName),
+            (gcie.School, cdt.displayProperties, gcie.hasOwnership),
+            (gcie.School, cdt.displayProperties, cdt.website),
+            (gcie.School, cdt.displayProperties, cdt.languageOfInstruction),
+            (gcie.School, cdt.displayProperties, cdt.religion),
+            (gcie.School, cdt.displayProperties, contact.hasTelephone),
+            (gcie.School, cdt.displayProperties, cdt.operator),
+            (gcie.School, cdt.displayProperties, cdt.osmID),
+            (gcie.School, cdt.displayProperties, contact.hasAddress),
+            (contact.PhoneNumber, cdt.displayProperties, contact.hasCountryCode),
+            (contact.PhoneNumber, cdt.displayProperties, contact.hasAreaCode),
+            (contact.PhoneNumber, cdt.displayProperties, contact.hasPhoneNumber),
+            (contact.PhoneNumber, cdt.displayProperties, contact.hasPhoneType),
+        ],
+        "output": "Schools.ttl",
+    },
+    "Kindergarten": {
+        "sources": {"school.geojson": [[("isced:level", "~", "0")]],
+                    "kindergarten.geojson": None},
+        "instance": "Kindergarten",
+        "classes": [cdt.Kindergarten],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Kindergarten, code.hasCode, cdt.level0ISCEDCode),
+            (cdt.level0ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level0ISCEDCode, genprop.hasName, Literal("0 Early childhood education")),
+            (cdt.level0ISCEDCode, genprop.hasDescription, Literal("Education designed to support early development in preparation for participation in school and society.")),
+            (cdt.Kindergarten, rdfs.subClassOf, gcie.EducationFacility),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Kindergarten, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Kindergarten, cdt.displayColor, Literal("#4287f5")),
+            # Generate triples for displayProperties
+            (cdt.Kindergarten, cdt.displayProperties, genprop.hasName),
+            (cdt.Kindergarten, cdt.displayProperties, cdt.website),
+            (cdt.Kindergarten, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Kindergarten, cdt.displayProperties, cdt.operator),
+            (cdt.Kindergarten, cdt.displayProperties, cdt.osmID),
+            (cdt.Kindergarten, cdt.displayProperties, contact.hasAddress),
+        ],
+        "output": "Kindergartens.ttl",
+    },
+    "College": {
+        "sources": {"college.geojson": None},
+        "instance": "College",
+        "classes": [cdt.College],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.College, code.hasCode, cdt.level4ISCEDCode),
+            (cdt.level4ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level4ISCEDCode, genprop.hasName, Literal("4 Post-secondary non-tertiary education")),
+            (cdt.level4ISCEDCode, genprop.hasDescription, Literal("Programmes providing learning experiences that build on secondary education and prepare for labour market entry or tertiary education.")),
+            (cdt.College, rdfs.subClassOf, gcie.EducationFacility),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.College, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.College, cdt.displayColor, Literal("#4287f5")),
+            # Generate triples for displayProperties
+            (cdt.College, cdt.displayProperties, genprop.hasName),
+            (cdt.College, cdt.displayProperties, cdt.website),
+            (cdt.College, cdt.displayProperties, contact.hasTelephone),
+            (cdt.College, cdt.displayProperties, cdt.operator),
+            (cdt.College, cdt.displayProperties, cdt.osmID),
+            (cdt.College, cdt.displayProperties, contact.hasAddress),
+        ],
+        "output": "College.ttl",
+    },
+    "University": {
+        "sources": {"university.geojson": None},
+        "instance": "University",
+        "classes": [cdt.University],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.University, code.hasCode, cdt.level6ISCEDCode),
+            (cdt.level6ISCEDCode, RDF.type, cdt.ISCEDCode),
+            (cdt.level6ISCEDCode, genprop.hasName, Literal("6 Bachelor's or equivalent")),
+            (cdt.level6ISCEDCode, genprop.hasDescription, Literal("Programmes designed to provide intermediate academic or professional knowledge, skills and competencies leading to a first tertiary degree or equivalent qualification.")),
+            (cdt.University, rdfs.subClassOf, gcie.EducationFacility),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.University, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.University, cdt.displayColor, Literal("#4287f5")),
+            # Generate triples for displayProperties
+            (cdt.University, cdt.displayProperties, genprop.hasName),
+            (cdt.University, cdt.displayProperties, cdt.website),
+            (cdt.University, cdt.displayProperties, contact.hasTelephone),
+            (cdt.University, cdt.displayProperties, cdt.operator),
+            (cdt.University, cdt.displayProperties, cdt.osmID),
+            (cdt.University, cdt.displayProperties, contact.hasAddress),
+        ],
+        "output": "University.ttl",
+    },
+    "Park": {
+        "sources": {"park.geojson": None},
+        "instance": "Park",
+        "classes": [gcir.Park],
+        "properties": {
+            "name": genprop.hasName,
+            "opening_hours": cdt.openingHours,
+            "website": cdt.website,
+            "lit": cdt.lit,
+            "operator": cdt.operator,
+            "operator:type": cdt.operatorType,
+            "surface": cdt.surface,
+        },
+        "phones": [],
+        "area": True,
+        "schema": [
+            (gcir.Park, code.hasCode, cdt.parkOSMCode),
+            (gcir.parkOSMCode, RDF.type, cdt.LeisureOSMCode),
+            (cdt.parkOSMCode, genprop.hasName, Literal("leisure=park")),
+            (cdt.parkOSMCode, genprop.hasDescription, Literal("A park, usually in an urban (municipal) setting, created for recreation and relaxation. ")),
+            (cdt.LeisureOSMCode, rdfs.subClassOf, code.Code),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (gcir.Park, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (gcir.Park, cdt.displayColor, Literal("#24b34a")),
+            # Generate triples for displayProperties
+            (gcir.Park, cdt.displayProperties, genprop.hasName),
+            (gcir.Park, cdt.displayProperties, cdt.lit),
+            (gcir.Park, cdt.displayProperties, cdt.website),
+            (gcir.Park, cdt.displayProperties, cdt.openingHours),
+            (gcir.Park, cdt.displayProperties, cdt.surface),
+            (gcir.Park, cdt.displayProperties, cdt.operatorType),
+            (gcir.Park, cdt.displayProperties, cdt.operator),
+            (gcir.Park, cdt.displayProperties, cdt.osmID),
+            (gcir.Park, cdt.displayProperties, cityunits.hasArea),
+            (gcir.Park, cdt.displayProperties, contact.hasAddress),
+            (contact.Address, cdt.displayProperties, contact.hasUnitNumber),
+            (contact.Address, cdt.displayProperties, contact.hasStreet),
+            (contact.Address, cdt.displayProperties, contact.hasStreetType),
+            (contact.Address, cdt.displayProperties, contact.hasStreetDirection),
+            (contact.Address, cdt.displayProperties, contact.hasStreetNumber),
+            (contact.Address, cdt.displayProperties, contact.hasBuilding),
+            (contact.Address, cdt.displayProperties, contact.hasPostalBox),
+            (contact.Address, cdt.displayProperties, contact.hasPostalCode),
+            (contact.Address, cdt.displayProperties, contact.hasCity),
+            (contact.Address, cdt.displayProperties, contact.hasProvince),
+            (contact.Address, cdt.displayProperties, contact.hasCountry),
+            (cityunits.Area, cdt.displayProperties, iso21972.value),
+            (iso21972.Measure, cdt.displayProperties, iso21972.numerical_value),
+            # Generate an instance for Ontario and Canada
+            (cdt.ontario, RDF.type, sc.State),
+            (cdt.canada, RDF.type, sc.Country),
+        ],
+        "output": "Parks2.ttl",
+    },
+    "Pharmacy": {
+        "sources": {"pharmacy.geojson": None},
+        "instance": "Pharmacy",
+        "classes": [cdt.Pharmacy],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+            "dispensing": cdt.dispensing,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Pharmacy, code.hasCode, cdt.pharmacyOSMCode),
+            (cdt.pharmacyOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.pharmacyOSMCode, genprop.hasName, Literal("amenity=pharmacy")),
+            (cdt.pharmacyOSMCode, genprop.hasDescription, Literal("A shop where a pharmacist sells medications.")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Pharmacy, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Pharmacy, cdt.displayColor, Literal("#42c2f5")),
+            # Generate triples for displayProperties
+            (cdt.Pharmacy, cdt.displayProperties, genprop.hasName),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.website),
+            (cdt.Pharmacy, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.operator),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.osmID),
+            (cdt.Pharmacy, cdt.displayProperties, contact.hasAddress),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.email),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.openingHours),
+            (cdt.Pharmacy, cdt.displayProperties, cdt.dispensing),
+        ],
+        "output": "Pharmacy.ttl",
+    },
+    "Supermarket": {
+        "sources": {"supermarket.geojson": None},
+        "instance": "Supermarket",
+        "classes": [cdt.Supermarket],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Supermarket, code.hasCode, cdt.supermarketOSMCode),
+            (cdt.supermarketOSMCode, RDF.type, cdt.ShopOSMCode),
+            (cdt.shopOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.supermarketOSMCode, genprop.hasName, Literal("shop=supermarket")),
+            (cdt.supermarketOSMCode, genprop.hasDescription, Literal("A large shop selling groceries, fresh produce, and other goods.")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Supermarket, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Supermarket, cdt.displayColor, Literal("#f59042")),
+            # Generate triples for displayProperties
+            (cdt.Supermarket, cdt.displayProperties, genprop.hasName),
+            (cdt.Supermarket, cdt.displayProperties, cdt.website),
+            (cdt.Supermarket, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Supermarket, cdt.displayProperties, cdt.operator),
+            (cdt.Supermarket, cdt.displayProperties, cdt.osmID),
+            (cdt.Supermarket, cdt.displayProperties, contact.hasAddress),
+            (cdt.Supermarket, cdt.displayProperties, cdt.email),
+            (cdt.Supermarket, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.Supermarket, cdt.displayProperties, cdt.openingHours),
+        ],
+        "output": "Supermarket.ttl",
+    },
+    "Greengrocer": {
+        "sources": {"greengrocer.geojson": None},
+        "instance": "Greengrocer",
+        "classes": [cdt.Greengrocer],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "opening_hours": cdt.openingHours,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Greengrocer, code.hasCode, cdt.greengrocerOSMCode),
+            (cdt.greengrocerOSMCode, RDF.type, cdt.ShopOSMCode),
+            (cdt.greengrocerOSMCode, genprop.hasName, Literal("shop=greengrocer")),
+            (cdt.greengrocerOSMCode, genprop.hasDescription, Literal("A shop which sells fruits and vegetables")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Greengrocer, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Greengrocer, cdt.displayColor, Literal("#f59042")),
+            # Generate triples for displayProperties
+            (cdt.Greengrocer, cdt.displayProperties, genprop.hasName),
+            (cdt.Greengrocer, cdt.displayProperties, cdt.website),
+            (cdt.Greengrocer, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Greengrocer, cdt.displayProperties, cdt.osmID),
+            (cdt.Greengrocer, cdt.displayProperties, contact.hasAddress),
+            (cdt.Greengrocer, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.Greengrocer, cdt.displayProperties, cdt.openingHours),
+        ],
+        "output": "Greengrocer.ttl",
+    },
+    "Restaurant": {
+        "sources": {"restaurant.geojson": None},
+        "instance": "Restaurant",
+        "classes": [cdt.Restaurant],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+            "cuisine": cdt.cuisine,
+            "smoking": cdt.smoking,
+            "delivery": cdt.delivery,
+            "takeaway": cdt.takeaway,
+            "outdoor_seating": cdt.outdoorSeating,
+            "capacity": cdt.capacity,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Restaurant, code.hasCode, cdt.restaurantOSMCode),
+            (cdt.restaurantOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.restaurantOSMCode, genprop.hasName, Literal("amenity=restaurant")),
+            (cdt.restaurantOSMCode, genprop.hasDescription, Literal("A restaurant sells full sit-down meals with servers, and may sell alcohol.")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Restaurant, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Restaurant, cdt.displayColor, Literal("#c47233")),
+            # Generate triples for displayProperties
+            (cdt.Restaurant, cdt.displayProperties, genprop.hasName),
+            (cdt.Restaurant, cdt.displayProperties, cdt.website),
+            (cdt.Restaurant, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Restaurant, cdt.displayProperties, cdt.operator),
+            (cdt.Restaurant, cdt.displayProperties, cdt.osmID),
+            (cdt.Restaurant, cdt.displayProperties, contact.hasAddress),
+            (cdt.Restaurant, cdt.displayProperties, cdt.email),
+            (cdt.Restaurant, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.Restaurant, cdt.displayProperties, cdt.openingHours),
+            (cdt.Restaurant, cdt.displayProperties, cdt.cuisine),
+            (cdt.Restaurant, cdt.displayProperties, cdt.delivery),
+            (cdt.Restaurant, cdt.displayProperties, cdt.smoking),
+            (cdt.Restaurant, cdt.displayProperties, cdt.takeaway),
+            (cdt.Restaurant, cdt.displayProperties, cdt.outdoorSeating),
+            (cdt.Restaurant, cdt.displayProperties, cdt.capacity),
+        ],
+        "output": "Restaurant.ttl",
+    },
+    "FastFood": {
+        "sources": {"fastfood.geojson": None},
+        "instance": "FastFood",
+        "classes": [cdt.FastFood],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+            "cuisine": cdt.cuisine,
+            "smoking": cdt.smoking,
+            "delivery": cdt.delivery,
+            "takeaway": cdt.takeaway,
+            "outdoor_seating": cdt.outdoorSeating,
+            "capacity": cdt.capacity,
+            "drive_through": cdt.driveThrough,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.FastFood, code.hasCode, cdt.fastFoodOSMCode),
+            (cdt.fastFoodOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.fastFoodOSMCode, genprop.hasName, Literal("amenity=fastfood")),
+            (cdt.fastFoodOSMCode, genprop.hasDescription, Literal("A place concentrating on very fast counter-only service and take-away food")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.FastFood, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.FastFood, cdt.displayColor, Literal("#c47233")),
+            # Generate triples for displayProperties
+            (cdt.FastFood, cdt.displayProperties, genprop.hasName),
+            (cdt.FastFood, cdt.displayProperties, cdt.website),
+            (cdt.FastFood, cdt.displayProperties, contact.hasTelephone),
+            (cdt.FastFood, cdt.displayProperties, cdt.operator),
+            (cdt.FastFood, cdt.displayProperties, cdt.osmID),
+            (cdt.FastFood, cdt.displayProperties, contact.hasAddress),
+            (cdt.FastFood, cdt.displayProperties, cdt.email),
+            (cdt.FastFood, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.FastFood, cdt.displayProperties, cdt.openingHours),
+            (cdt.FastFood, cdt.displayProperties, cdt.cuisine),
+            (cdt.FastFood, cdt.displayProperties, cdt.delivery),
+            (cdt.FastFood, cdt.displayProperties, cdt.smoking),
+            (cdt.FastFood, cdt.displayProperties, cdt.takeaway),
+            (cdt.FastFood, cdt.displayProperties, cdt.outdoorSeating),
+            (cdt.FastFood, cdt.displayProperties, cdt.capacity),
+            (cdt.FastFood, cdt.displayProperties, cdt.driveThrough),
+        ],
+        "output": "FastFood.ttl",
+    },
+    "Hospital": {
+        "sources": {"hospital.geojson": None},
+        "instance": "Hospital",
+        "classes": [],
+        "classrule": hospital_classes,
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "emergency": cdt.emergencyServices,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Hospital, code.hasCode, cdt.hospitalOSMCode),
+            (cdt.hospitalOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.hospitalOSMCode, genprop.hasName, Literal("amenity=hospital")),
+            (cdt.hospitalOSMCode, genprop.hasDescription, Literal("A hospital providing in-patient medical treatment")),
+            (gcih.PublicHospital, rdfs.subClassOf, sc.Hospital),
+            (gcih.PrivateHospital, rdfs.subClassOf, sc.Hospital),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (sc.Hospital, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (sc.Hospital, cdt.displayColor, Literal("#fc2323")),
+            # Generate triples for displayProperties
+            (sc.Hospital, cdt.displayProperties, genprop.hasName),
+            (sc.Hospital, cdt.displayProperties, cdt.website),
+            (sc.Hospital, cdt.displayProperties, contact.hasTelephone),
+            (sc.Hospital, cdt.displayProperties, cdt.operator),
+            (sc.Hospital, cdt.displayProperties, cdt.osmID),
+            (sc.Hospital, cdt.displayProperties, contact.hasAddress),
+            (sc.Hospital, cdt.displayProperties, cdt.wheelchairAccess),
+            (sc.Hospital, cdt.displayProperties, cdt.openingHours),
+            (sc.Hospital, cdt.displayProperties, cdt.operatorType),
+            (sc.Hospital, cdt.displayProperties, cdt.emergencyServices),
+        ],
+        "output": "Hospital.ttl",
+    },
+    "Clinic": {
+        "sources": {"clinic.geojson": None},
+        "instance": "Clinic",
+        "classes": [cdt.Clinic],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Clinic, code.hasCode, cdt.clinicOSMCode),
+            (cdt.clinicOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.clinicOSMCode, genprop.hasName, Literal("amenity=clinic")),
+            (cdt.clinicOSMCode, genprop.hasDescription, Literal("A clinic is a medical centre, with more staff than a doctor's office, that does not admit inpatients.")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.Clinic, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.Clinic, cdt.displayColor, Literal("#fc2323")),
+            # Generate triples for displayProperties
+            (cdt.Clinic, cdt.displayProperties, genprop.hasName),
+            (cdt.Clinic, cdt.displayProperties, cdt.website),
+            (cdt.Clinic, cdt.displayProperties, contact.hasTelephone),
+            (cdt.Clinic, cdt.displayProperties, cdt.operator),
+            (cdt.Clinic, cdt.displayProperties, cdt.osmID),
+            (cdt.Clinic, cdt.displayProperties, contact.hasAddress),
+            (cdt.Clinic, cdt.displayProperties, cdt.email),
+            (cdt.Clinic, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.Clinic, cdt.displayProperties, cdt.openingHours),
+        ],
+        "output": "Clinic.ttl",
+    },
+    "Doctors": {
+        "sources": {"doctors.geojson": None},
+        "instance": "DoctorsOffice",
+        "classes": [cdt.DoctorsOffice],
+        "properties": {
+            "name": genprop.hasName,
+            "website": cdt.website,
+            "wheelchair": cdt.wheelchairAccess,
+            "operator": cdt.operator,
+            "opening_hours": cdt.openingHours,
+            "email": cdt.email,
+            "contact:email": cdt.email,
+        },
+        "phones": [("phone", "Telephone", contact.workPhone)],
+        "schema": [
+            (cdt.Doctors, code.hasCode, cdt.doctorsOSMCode),
+            (cdt.doctorsOSMCode, RDF.type, cdt.AmenityOSMCode),
+            (cdt.AmenityOSMCode, rdfs.subClassOf, code.Code),
+            (cdt.doctorsOSMCode, genprop.hasName, Literal("amenity=doctors")),
+            (cdt.doctorsOSMCode, genprop.hasDescription, Literal("A doctor's office, a place to get medical attention or a check up from a physician.")),
+            # Generate triples for CompleteCommunityAmenity superclass and displayColor
+            (cdt.DoctorsOffice, rdfs.subClassOf, cdt.CompleteCommunityAmenity),
+            (cdt.DoctorsOffice, cdt.displayColor, Literal("#fc2323")),
+            # Generate triples for displayProperties
+            (cdt.DoctorsOffice, cdt.displayProperties, genprop.hasName),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.website),
+            (cdt.DoctorsOffice, cdt.displayProperties, contact.hasTelephone),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.operator),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.osmID),
+            (cdt.DoctorsOffice, cdt.displayProperties, contact.hasAddress),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.email),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.wheelchairAccess),
+            (cdt.DoctorsOffice, cdt.displayProperties, cdt.openingHours),
+        ],
+        "output": "Doctors.ttl",
+    },
+}
+
+
+def add_address(add, instance, address, tags):
+    """
+    Generates the triples of the street address of a feature.
+
+    Parameters:
+    add (function): The function that adds a triple to the graph.
+    instance (rdflib.URIRef): The feature instance.
+    address (rdflib.URIRef): The address instance of the feature.
+    tags (dict): The OpenStreetMap tags of the feature.
+    """
+
+    if "addr:street" in tags:
+        try:
+            street = usaddress.tag(tags["addr:street"])[0]
+        except usaddress.RepeatedLabelError:
+            street = {}
+
+        if "StreetName" in street:
+            streetname = street.get("StreetNamePreModifier", "") + street.get("StreetNamePreDirectional", "") + street["StreetName"]
+            add((address, contact.hasStreet, Literal(streetname)))
+            if "StreetNamePostType" in street:
+                add((address, contact.hasStreetType, contact[street["StreetNamePostType"].lower()]))
+            if "StreetNamePostDirectional" in street:
+                add((address, contact.hasStreetDirection, contact[street["StreetNamePostDirectional"].lower()]))
+            add((address, contact.hasCity, toronto.toronto))
+            add((address, contact.hasProvince, cdt.ontario))
+            add((address, contact.hasCountry, cdt.canada))
+            add((address, RDF.type, contact.Address))
+            add((instance, contact.hasAddress, address))
+
+    if "addr:housenumber" in tags:
+        add((address, contact.hasStreetNumber, Literal(tags["addr:housenumber"])))
+    if "addr:postcode" in tags:
+        add((address, contact.hasPostalCode, Literal(tags["addr:postcode"])))
+
+
+def add_phone(add, instance, telephone, number, phonetype):
+    """
+    Generates the triples of a telephone number of a feature.
+
+    Parameters:
+    add (function): The function that adds a triple to the graph.
+    instance (rdflib.URIRef): The feature instance.
+    telephone (rdflib.URIRef): The telephone number instance.
+    number (str): The telephone number in international format, e.g. "+1 416 555 1234".
+    phonetype (rdflib.URIRef): The phone type, e.g. contact.workPhone.
+    """
+
+    # Numbers without a country code cannot be parsed without a region
+    try:
+        phonenumber = phonenumbers.parse(number, None)
+    except phonenumbers.NumberParseException:
+        return
+
+    nationalnumber = str(phonenumber.national_number)
+    add((instance, contact.hasTelephone, telephone))
+    add((telephone, RDF.type, contact.PhoneNumber))
+    add((telephone, contact.hasCountryCode, Literal(phonenumber.country_code)))
+    add((telephone, contact.hasAreaCode, Literal(int(nationalnumber[:3]))))
+    if len(nationalnumber) > 3:
+        add((telephone, contact.hasPhoneNumber, Literal(int(nationalnumber[3:]))))
+        add((telephone, contact.hasPhoneType, phonetype))
+
+
+def add_schema(sink, mapping):
+    """
+    Writes the schema triples of an amenity category.
+
+    Parameters:
+    sink (TripleSink): The output of the category.
+    mapping (dict): The mapping specification of the category.
+    """
+
+    for triple in mapping["schema"]:
+        sink.add_schema(triple)
+
+
+def compile_mapping(mapping, g):
+    """
+    Compiles the mapping specification of an amenity category into a function
+    that adds the triples of one feature to a graph.
+
+    Parameters:
+    mapping (dict): The mapping specification of the category.
+    g (TripleSink): The output of the category, or an rdflib Graph.
+
+    Returns:
+    function: A function of a GeoJSON feature, the WKT of its geometry and its
+              surface area in square metres (only used if the category has
+              area), that adds the triples of the feature.
+    """
+
+    # Bind everything the function needs to local variables once
+    add = g.add
+    instancesuffix = mapping["instance"]
+    classes = mapping["classes"]
+    classrule = mapping.get("classrule")
+    properties = dict(mapping["properties"])
+    phones = mapping["phones"]
+    hasarea = mapping.get("area", False)
+
+    def map_feature(element, wkt, area=None):
+        tags = element["properties"]
+        osmid = nondigits.sub("", element["id"])
+        instancename = osmid + instancesuffix
+        instance = cdt[instancename]
+        location = cdt[instancename + "Location"]
+
+        for instanceclass in classes:
+            add((instance, RDF.type, instanceclass))
+        if classrule is not None:
+            for predicate, value in classrule(tags):
+                add((instance, predicate, value))
+
+        add((location, geo.asWKT, Literal(wkt, datatype=geo.wktLiteral)))
+        add((instance, loc.hasLocation, location))
+        add((instance, gci.forCity, toronto.toronto))
+        add((instance, cdt.osmID, Literal(osmid)))
+        add((location, RDF.type, loc.Location))
+
+        # Generate triples for surface area
+        if hasarea:
+            areainstance = cdt[instancename + "Area"]
+            measure = cdt[instancename + "AreaMeasure"]
+            add((areainstance, RDF.type, cityunits.Area))
+            add((measure, RDF.type, iso21972.Measure))
+            add((instance, cityunits.hasArea, areainstance))
+            add((areainstance, iso21972.value, measure))
+            add((measure, iso21972.unit_of_measure, iso21972.square_metre))
+            add((measure, iso21972.numerical_value, Literal(area)))
+
+        # Generate triples for optional properties, visiting only the tags the
+        # feature has, since most features lack most of the mapped tags
+        for tag, value in tags.items():
+            predicate = properties.get(tag)
+            if predicate is not None and value is not None:
+                add((instance, predicate, Literal(value)))
+
+        add_address(add, instance, cdt[instancename + "Address"], tags)
+
+        for tag, suffix, phonetype in phones:
+            if tag in tags:
+                add_phone(add, instance, cdt[instancename + suffix], tags[tag], phonetype)
+
+    return map_feature
+
+
+def feature_matches(sourcefilters, properties):
+    """
+    Checks if a feature of a GeoJSON file belongs to an amenity category.
+
+    Parameters:
+    sourcefilters (list): The filters of the file in the sources of the
+                          category, or None to accept every feature.
+    properties (dict): The OpenStreetMap tags of the feature.
+
+    Returns:
+    bool: True if the feature is mapped by the category.
+    """
+
+    return sourcefilters is None or filter_matches(sourcefilters, properties)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+"""
+Checkpoint.py
+
+Description: This is a Python module that saves the per-neighborhood results of
+the walking distance indicator programs to a JSON Lines file as soon as each
+neighborhood is completed. A run that is restarted with resume enabled skips
+the neighborhoods found in the file, so a failure only loses the neighborhoods
+that were in progress.
+
+Each entry is stored with the SHA-256 hash of the Overpass QL query it was
+computed from, and it is only reused for the same query. A checkpoint written
+with other filters, another walking distance, another polygon simplification or
+another version of the query builders is therefore never reused, and its
+neighborhoods are queried again.
+
+"""
+
+# Import modules
+import os
+import json
+import hashlib
+import threading
+
+
+class Checkpoint:
+    """
+    Append-only record of the totals of each completed neighborhood.
+
+    Parameters:
+    filename (str): The JSON Lines file the totals are written to.
+    resume (bool): Keep the totals of a previous run. If False, the file is
+                   emptied and every neighborhood is computed again.
+    """
+
+    def __init__(self, filename, resume=True):
+        self.filename = filename
+        self.totals = {}
+        self.lock = threading.Lock()
+
+        if resume and os.path.exists(filename):
+            with open(filename, encoding="utf8") as f:
+                for line in f:
+                    # The last line may be incomplete if the run was killed while writing it
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    # Entries written before the query was stored are never reused
+                    if "query" in entry:
+                        self.totals[entry["area"]] = (entry["query"], entry["totals"])
+            print("Resuming with " + str(len(self.totals)) + " completed neighborhoods")
+        elif os.path.exists(filename):
+            os.remove(filename)
+
+        self.file = open(filename, "a", encoding="utf8")
+
+        # Start on a new line if the run was killed while writing the last one
+        if self.file.tell() > 0:
+            with open(filename, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read() != b"\n":
+                    self.file.write("\n")
+
+    @staticmethod
+    def key(query):
+        """
+        Computes the key of the query a neighborhood is counted with.
+
+        Parameters:
+        query (str): The Overpass QL query.
+
+        Returns:
+        str: The hexadecimal SHA-256 hash of the query.
+        """
+
+        return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+    def get(self, area, query):
+        """
+        Reads the totals of a neighborhood completed by a previous run.
+
+        Parameters:
+        area (str): The neighborhood URI.
+        query (str): The Overpass QL query the neighborhood is counted with.
+
+        Returns:
+        The totals of the neighborhood, or None if it was not completed or was
+        counted with another query.
+        """
+
+        key, totals = self.totals.get(area, (None, None))
+        if key != self.key(query):
+            return None
+
+        return totals
+
+    def record(self, area, totals, query):
+        """
+        Saves the totals of a completed neighborhood.
+
+        Parameters:
+        area (str): The neighborhood URI.
+        totals: The JSON serializable totals of the neighborhood.
+        query (str): The Overpass QL query the neighborhood was counted with.
+        """
+
+        key = self.key(query)
+        line = json.dumps({"area": area, "query": key, "totals": totals}) + "\n"
+
+        with self.lock:
+            self.totals[area] = (key, json.loads(line)["totals"])
+            self.file.write(line)
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        self.file.close()
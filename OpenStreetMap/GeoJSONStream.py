@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+GeoJSONStream.py
+
+Description: This is a Python module that reads the features of a GeoJSON file
+one at a time, so that a program mapping a province-wide extract never holds
+the whole file or its parsed feature list in memory.
+
+A FeatureCollection (e.g. the overpass-turbo exports) is parsed incrementally
+with ijson. A line-delimited GeoJSON file (.geojsonl, .geojsons, .geojsonseq,
+.ndjson or .jsonl) holds one feature per line, optionally preceded by the
+record separator of RFC 8142, and is parsed a line at a time with json.
+
+"""
+
+# Import modules
+import json
+import ijson
+
+from itertools import islice
+
+# Extensions of the line-delimited GeoJSON files
+linedelimited = (".geojsonl", ".geojsons", ".geojsonseq", ".ndjson", ".jsonl")
+
+
+def iter_features(filename):
+    """
+    Reads the features of a GeoJSON file incrementally.
+
+    Parameters:
+    filename (str): A GeoJSON FeatureCollection or line-delimited GeoJSON file.
+
+    Returns:
+    generator: The features of the file as GeoJSON dictionaries, in file order.
+    """
+
+    if filename.lower().endswith(linedelimited):
+        with open(filename, encoding='utf8') as file:
+            for line in file:
+                line = line.strip("\x1e \t\r\n")
+                if line:
+                    yield json.loads(line)
+    else:
+        with open(filename, "rb") as file:
+            yield from ijson.items(file, "features.item", use_float=True)
+
+
+def iter_batches(features, size):
+    """
+    Groups the features read by iter_features into lists, so that their
+    geometries can be converted in bulk with a bounded amount of memory.
+
+    Parameters:
+    features (iterable): The features.
+    size (int): The number of features of a batch.
+
+    Returns:
+    generator: Lists of at most size features.
+    """
+
+    features = iter(features)
+    while True:
+        batch = list(islice(features, size))
+        if not batch:
+            return
+        yield batch
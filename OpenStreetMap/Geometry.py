@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Geometry.py
+
+Description: This is a Python module that holds the geometry operations shared
+by the OpenStreetMap programs. OpenStreetMap geometries are stored in WGS84
+longitude/latitude, so distances, buffers and areas computed on them directly
+are in degrees. The geometries are instead reprojected once to a metric CRS with
+a single vectorized pyproj Transformer call per array, after which buffering,
+distance and area are plain Shapely array operations in metres.
+
+"""
+
+# Import modules
+import numpy as np
+import shapely
+
+from pyproj import Proj, Transformer
+
+# Metric CRS used for distances: NAD83(CSRS) / MTM zone 10, which covers Toronto
+metriccrs = "EPSG:2952"
+
+transformer = Transformer.from_crs("EPSG:4326", metriccrs, always_xy=True)
+inversetransformer = Transformer.from_crs(metriccrs, "EPSG:4326", always_xy=True)
+projection = Proj(metriccrs)
+
+
+def project(geometries):
+    """
+    Reprojects an array of WGS84 geometries to the metric CRS.
+
+    Parameters:
+    geometries (numpy.ndarray): Shapely geometries with longitude/latitude coordinates.
+
+    Returns:
+    numpy.ndarray: The geometries with coordinates in metres.
+    """
+
+    return shapely.transform(geometries, lambda coords: np.column_stack(transformer.transform(coords[:, 0], coords[:, 1])))
+
+
+def unproject(geometries):
+    """
+    Reprojects an array of geometries from the metric CRS back to WGS84.
+
+    Parameters:
+    geometries (numpy.ndarray): Shapely geometries with coordinates in metres.
+
+    Returns:
+    numpy.ndarray: The geometries with longitude/latitude coordinates.
+    """
+
+    return shapely.transform(geometries, lambda coords: np.column_stack(inversetransformer.transform(coords[:, 0], coords[:, 1])))
+
+
+def simplify(geometries, tolerance):
+    """
+    Simplifies WGS84 geometries with a tolerance in metres, without creating
+    invalid or self-intersecting polygons.
+
+    Parameters:
+    geometries (numpy.ndarray): Shapely geometries with longitude/latitude coordinates.
+    tolerance (float): The largest distance in metres a simplified boundary may
+                       move away from the original one.
+
+    Returns:
+    numpy.ndarray: The simplified geometries with longitude/latitude coordinates.
+    """
+
+    return unproject(shapely.simplify(project(geometries), tolerance, preserve_topology=True))
+
+
+def bounding_box(geometries, distance=0):
+    """
+    Computes the bounding box of WGS84 geometries, enlarged by a distance.
+
+    Parameters:
+    geometries (numpy.ndarray): Shapely geometries with longitude/latitude coordinates.
+    distance (float): The distance in metres added on every side.
+
+    Returns:
+    tuple: The (south, west, north, east) bounds in degrees, as used by the
+           Overpass API bbox setting.
+    """
+
+    xmin, ymin, xmax, ymax = shapely.total_bounds(project(geometries))
+    # Densify the edges so that the box still covers them once they are curved by the reprojection
+    box = unproject(shapely.segmentize(shapely.box(xmin - distance, ymin - distance, xmax + distance, ymax + distance), 100))
+    west, south, east, north = shapely.bounds(box)
+
+    return float(south), float(west), float(north), float(east)
+
+
+def area(geometries):
+    """
+    Computes the area of WGS84 geometries in square metres.
+
+    Parameters:
+    geometries (numpy.ndarray): Shapely geometries with longitude/latitude coordinates.
+
+    Returns:
+    numpy.ndarray: The area of every geometry in square metres, 0 for points and lines.
+    """
+
+    # Correct the projected area by the areal scale factor of the projection at
+    # the centroid, which matches the geodesic area to within a few millionths
+    centroids = shapely.centroid(geometries)
+    factors = projection.get_factors(shapely.get_x(centroids), shapely.get_y(centroids))
+
+    return shapely.area(project(geometries)) / factors.areal_scale
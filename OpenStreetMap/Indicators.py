@@ -0,0 +1,309 @@
+# -*- coding: utf-8 -*-
+"""
+Indicators.py
+
+Description: This is a Python module that holds the definitions shared by the
+neighborhood walking distance indicator programs: namespaces, the neighborhood
+SPARQL query, the amenity categories and the RDF triples emitted for each
+indicator.
+
+"""
+
+# Import modules
+import re
+import rdflib
+import sparql_dataframe
+
+from rdflib import Literal, XSD, RDF
+
+# Declare namespaces
+cdt = rdflib.Namespace('http://ontology.eil.utoronto.ca/CDT#')
+rdfs = rdflib.Namespace('http://www.w3.org/2000/01/rdf-schema#')
+iso21972 = rdflib.Namespace('http://ontology.eil.utoronto.ca/ISO21972/iso21972#')
+uoft = rdflib.Namespace('http://ontology.eil.utoronto.ca/tove/cacensus#')
+toronto = rdflib.Namespace('http://ontology.eil.utoronto.ca/Toronto/Toronto#')
+building = rdflib.Namespace('https://standards.iso.org/iso-iec/5087/-2/ed-1/en/ontology/Building/')
+
+# Declare SPARQL Endpoint
+endpoint = "http://ec2-3-97-59-180.ca-central-1.compute.amazonaws.com:7200/repositories/CACensus"
+
+# SPARQL query the City Digital Twin for neighborhood polygons
+neighbourhoodquery = """
+PREFIX toronto: <http://ontology.eil.utoronto.ca/Toronto/Toronto#>
+PREFIX iso50871: <http://ontology.eil.utoronto.ca/5087/1/SpatialLoc/>
+PREFIX geo: <http://www.opengis.net/ont/geosparql#>
+
+SELECT ?area ?coordinates
+
+WHERE{
+      ?area a toronto:Neighborhood;
+      iso50871:hasLocation ?location.
+
+      ?location geo:asWKT ?coordinates.
+}
+"""
+
+# Values of the building tag that count as a residential building
+residentialtags = ["apartments", "detached", "house", "semidetached_house", "terrace", "residential"]
+
+# Amenity categories evaluated by the walking distance indicators. Each filter
+# is a list of (key, operator, value) tag conditions that must all hold, where
+# the operator is "=" for an exact match or "~" for a regular expression, and
+# files lists the GeoJSON extracts that contain the amenity.
+amenities = {
+    "Park": {
+        "filters": [[("leisure", "=", "park")]],
+        "files": ["park.geojson"],
+    },
+    "School": {
+        "filters": [[("amenity", "=", "school")]],
+        "files": ["school.geojson"],
+    },
+    "Pharmacy": {
+        "filters": [[("amenity", "=", "pharmacy")]],
+        "files": ["pharmacy.geojson"],
+    },
+    "SupermarketGreengrocer": {
+        "filters": [[("shop", "=", "supermarket")],
+                    [("shop", "=", "greengrocer")]],
+        "files": ["supermarket.geojson", "greengrocer.geojson"],
+    },
+    "RestaurantFastFood": {
+        "filters": [[("amenity", "=", "restaurant")],
+                    [("amenity", "=", "fast_food")]],
+        "files": ["restaurant.geojson", "fastfood.geojson"],
+    },
+    "HospitalClinicDoctors": {
+        "filters": [[("amenity", "=", "hospital")],
+                    [("amenity", "=", "clinic")],
+                    [("amenity", "=", "doctors")]],
+        "files": ["hospital.geojson", "clinic.geojson", "doctors.geojson"],
+    },
+    "Kindergarten": {
+        "filters": [[("amenity", "=", "kindergarten")],
+                    [("amenity", "=", "school"), ("isced:level", "~", "0")]],
+        "files": ["kindergarten.geojson", "school.geojson"],
+    },
+    "College": {
+        "filters": [[("amenity", "=", "college")]],
+        "files": ["college.geojson"],
+    },
+    "University": {
+        "filters": [[("amenity", "=", "university")]],
+        "files": ["university.geojson"],
+    },
+}
+
+
+def get_neighbourhoods():
+    """
+    Queries the City Digital Twin for the neighborhood polygons.
+
+    Returns:
+    pandas.DataFrame: One row per neighborhood with the neighborhood URI in the
+                      "area" column and its WKT polygon in the "coordinates" column.
+    """
+
+    return sparql_dataframe.get(endpoint, neighbourhoodquery)
+
+
+def neighbourhood_name(area):
+    """
+    Strips the Toronto namespace from a neighborhood URI.
+
+    Parameters:
+    area (str): The neighborhood URI returned by the neighborhood query.
+
+    Returns:
+    str: The local name of the neighborhood.
+    """
+
+    return area.removeprefix('http://ontology.eil.utoronto.ca/Toronto/Toronto#')
+
+
+def filter_matches(filters, properties):
+    """
+    Checks if an OpenStreetMap feature satisfies any of the amenity filters.
+
+    Parameters:
+    filters (list): The amenity filters, as defined in the amenities dictionary.
+    properties (dict): The OpenStreetMap tags of the feature.
+
+    Returns:
+    bool: True if all the conditions of at least one filter hold.
+    """
+
+    for conditions in filters:
+        for key, operator, value in conditions:
+            if key not in properties:
+                break
+            if operator == "=" and properties[key] != value:
+                break
+            if operator == "~" and re.search(value, properties[key]) is None:
+                break
+        else:
+            return True
+    return False
+
+
+def add_walking_distance_schema(g, amenity, walkdistance, buildings=True):
+    """
+    Generates the class triples of a walking distance indicator. These only
+    need to be generated once per graph.
+
+    Parameters:
+    g (rdflib.Graph): The graph the triples are added to.
+    amenity (str): The amenity category, e.g. "Park".
+    walkdistance (str): The walking distance in metres, e.g. "400".
+    buildings (bool): Also generate the NumberOfResidentialBuildings classes.
+    """
+
+    # Initialize variables
+    percentclass = "PercentWalkingDistance" + walkdistance + amenity
+    percentsuperclass = "PercentWalkingDistance" + amenity
+
+    buildingclass = "NumberOfResidentialBuildings"
+    buildingpopulationclass = buildingclass + "Population"
+    buildingdefineclass = "ResidentialBuilding"
+
+    walkingclass = "NumberOfResidentialBuildingsWalkingDistance" + walkdistance + amenity
+    walkingsuperclass = "NumberOfResidentialBuildingsWalkingDistance" + amenity
+    walkingpopulationclass = walkingclass + "Population"
+    walkingdefineclass = "ResidentialBuildingWalkingDistance" + walkdistance + amenity
+    walkingdefinesuperclass = "ResidentialBuildingWalkingDistance" + amenity
+
+    g.add((cdt[percentclass], rdfs.subClassOf, cdt[percentsuperclass]))
+    g.add((cdt[percentsuperclass], rdfs.subClassOf, iso21972.Indicator))
+    g.add((cdt[percentclass], iso21972.numerator, cdt[walkingclass]))
+    g.add((cdt[percentclass], iso21972.denominator, cdt[buildingclass]))
+    g.add((cdt[percentclass], uoft.hasLocation, toronto.Neighbourhood))
+
+    g.add((cdt[walkingclass], rdfs.subClassOf, cdt[walkingsuperclass]))
+    g.add((cdt[walkingsuperclass], rdfs.subClassOf, iso21972.Indicator))
+    g.add((cdt[walkingpopulationclass], rdfs.subClassOf, iso21972.Population))
+    g.add((cdt[walkingpopulationclass], iso21972.defined_by, cdt[walkingdefineclass]))
+    g.add((cdt[walkingdefineclass], rdfs.subClassOf, cdt[walkingdefinesuperclass]))
+    g.add((cdt[walkingdefineclass], cdt.walkDistancePark, Literal("<=" + walkdistance)))
+    g.add((cdt[walkingdefinesuperclass], rdfs.subClassOf, cdt[buildingdefineclass]))
+
+    if buildings:
+        g.add((cdt[buildingclass], rdfs.subClassOf, iso21972.Indicator))
+        g.add((cdt[buildingpopulationclass], rdfs.subClassOf, iso21972.Population))
+        g.add((cdt[buildingpopulationclass], iso21972.defined_by, cdt[buildingdefineclass]))
+        g.add((cdt[buildingdefineclass], rdfs.subClassOf, building.Building))
+
+
+def add_walking_distance_indicators(g, neighbourhood, amenity, walkdistance, buildingtotal, walkingdistancetotal, buildings=True):
+    """
+    Generates the indicator triples of a walking distance indicator for one
+    neighborhood.
+
+    Parameters:
+    g (rdflib.Graph): The graph the triples are added to.
+    neighbourhood (str): The local name of the neighborhood.
+    amenity (str): The amenity category, e.g. "Park".
+    walkdistance (str): The walking distance in metres, e.g. "400".
+    buildingtotal (int): The number of residential buildings in the neighborhood.
+    walkingdistancetotal (int): The number of those buildings within walking
+                                distance of the amenity.
+    buildings (bool): Also generate the NumberOfResidentialBuildings indicator.
+    """
+
+    # Initialize variables
+    buildingtotal = int(buildingtotal)
+    walkingdistancetotal = int(walkingdistancetotal)
+
+    percentclass = "PercentWalkingDistance" + walkdistance + amenity
+    percentindicator = neighbourhood + percentclass
+    percentmeasure = percentindicator + "Measure"
+    if buildingtotal == 0:
+        percentvalue = 0
+    else:
+        percentvalue = walkingdistancetotal/buildingtotal
+
+    buildingclass = "NumberOfResidentialBuildings"
+    buildingindicator = neighbourhood + buildingclass
+    buildingmeasure = buildingindicator + "Measure"
+    buildingpopulation = buildingindicator + "Population"
+    buildingpopulationclass = buildingclass + "Population"
+
+    walkingclass = "NumberOfResidentialBuildingsWalkingDistance" + walkdistance + amenity
+    walkingindicator = neighbourhood + walkingclass
+    walkingmeasure = walkingindicator + "Measure"
+    walkingpopulation = walkingindicator + "Population"
+    walkingpopulationclass = walkingclass + "Population"
+
+    # Generates indicator triples for the neighborhood
+    g.add((cdt[percentindicator], RDF.type, cdt[percentclass]))
+    g.add((cdt[percentindicator], uoft.hasLocation, toronto[neighbourhood]))
+    g.add((cdt[percentindicator], iso21972.value, cdt[percentmeasure]))
+    g.add((cdt[percentindicator], iso21972.hasUnit, iso21972.population_ratio_unit))
+    g.add((cdt[percentmeasure], RDF.type, iso21972.Measure))
+    g.add((cdt[percentmeasure], iso21972.numerical_value, Literal(round(percentvalue, 4), datatype=XSD.decimal)))
+    g.add((cdt[percentindicator], iso21972.numerator, cdt[walkingindicator]))
+    g.add((cdt[percentindicator], iso21972.denominator, cdt[buildingindicator]))
+
+    if buildings:
+        g.add((cdt[buildingindicator], RDF.type, cdt[buildingclass]))
+        g.add((cdt[buildingindicator], uoft.hasLocation, toronto[neighbourhood]))
+        g.add((cdt[buildingindicator], iso21972.value, cdt[buildingmeasure]))
+        g.add((cdt[buildingindicator], iso21972.hasUnit, iso21972.population_cardinality_unit))
+        g.add((cdt[buildingindicator], iso21972.cardinality_of, cdt[buildingpopulation]))
+        g.add((cdt[buildingpopulation], RDF.type, cdt[buildingpopulationclass]))
+        g.add((cdt[buildingmeasure], iso21972.numerical_value, Literal(buildingtotal, datatype=XSD.integer)))
+        g.add((cdt[buildingmeasure], RDF.type, iso21972.Measure))
+
+    g.add((cdt[walkingindicator], RDF.type, cdt[walkingclass]))
+    g.add((cdt[walkingindicator], uoft.hasLocation, toronto[neighbourhood]))
+    g.add((cdt[walkingindicator], iso21972.value, cdt[walkingmeasure]))
+    g.add((cdt[walkingindicator], iso21972.hasUnit, iso21972.population_cardinality_unit))
+    g.add((cdt[walkingindicator], iso21972.cardinality_of, cdt[walkingpopulation]))
+    g.add((cdt[walkingpopulation], RDF.type, cdt[walkingpopulationclass]))
+    g.add((cdt[walkingmeasure], iso21972.numerical_value, Literal(walkingdistancetotal, datatype=XSD.integer)))
+    g.add((cdt[walkingmeasure], RDF.type, iso21972.Measure))
+
+
+def add_distance_schema(g, amenity, statistics):
+    """
+    Generates the class triples of the nearest amenity distance indicators.
+    These only need to be generated once per graph.
+
+    Parameters:
+    g (rdflib.Graph): The graph the triples are added to.
+    amenity (str): The amenity category, e.g. "Park".
+    statistics (list): The statistics of the distance, e.g. ["Median", "Percentile90"].
+    """
+
+    superclass = "DistanceToNearest" + amenity
+
+    g.add((cdt[superclass], rdfs.subClassOf, iso21972.Indicator))
+    for statistic in statistics:
+        g.add((cdt[statistic + superclass], rdfs.subClassOf, cdt[superclass]))
+        g.add((cdt[statistic + superclass], uoft.hasLocation, toronto.Neighbourhood))
+
+
+def add_distance_indicators(g, neighbourhood, amenity, statistics):
+    """
+    Generates the triples of the nearest amenity distance indicators for one
+    neighborhood.
+
+    Parameters:
+    g (rdflib.Graph): The graph the triples are added to.
+    neighbourhood (str): The local name of the neighborhood.
+    amenity (str): The amenity category, e.g. "Park".
+    statistics (dict): The value in metres of each statistic of the distance
+                       from the residential buildings of the neighborhood to
+                       their nearest amenity, e.g. {"Median": 212.5}.
+    """
+
+    for statistic, value in statistics.items():
+        distanceclass = statistic + "DistanceToNearest" + amenity
+        distanceindicator = neighbourhood + distanceclass
+        distancemeasure = distanceindicator + "Measure"
+
+        g.add((cdt[distanceindicator], RDF.type, cdt[distanceclass]))
+        g.add((cdt[distanceindicator], uoft.hasLocation, toronto[neighbourhood]))
+        g.add((cdt[distanceindicator], iso21972.value, cdt[distancemeasure]))
+        g.add((cdt[distanceindicator], iso21972.hasUnit, iso21972.metre))
+        g.add((cdt[distancemeasure], RDF.type, iso21972.Measure))
+        g.add((cdt[distancemeasure], iso21972.numerical_value, Literal(round(float(value), 1), datatype=XSD.decimal)))
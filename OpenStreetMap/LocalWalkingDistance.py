@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+"""
+LocalWalkingDistance.py
+
+Description: This is a Python program that generates neighborhood walking distance
+indicators by assigning residential buildings to neighborhoods locally instead of
+sending one Overpass API query per neighborhood polygon. It produces the same
+triples as Overpass.py and its siblings, for every walking distance listed in
+walkdistances: the distance from each building to its nearest amenity is
+computed once, up to the longest walking distance, and the buildings are then
+counted for each walking distance.
+
+With source set to "geojson", the residential buildings are read from
+residential.geojson, an Overpass Turbo export of
+nwr[building=apartments|detached|house|semidetached_house|terrace|residential]
+for the City of Toronto, and the amenities from the GeoJSON files listed for the
+amenity category in Indicators.py.
+
+With source set to "overpass", the residential buildings are downloaded with a
+single Overpass API query for the bounding box of all neighborhoods, and the
+amenities with a single query for that bounding box enlarged by the walking
+distance, so that amenities just outside the city are still counted.
+
+With network set to True, a building is within walking distance when the walk
+along the roads of roadfile, the ORN road net elements of
+RoadNetwork/ORNELEM/ORN_ROAD_NET_ELEMENT.shp, is at most the walking distance,
+instead of the straight line distance used by the Overpass around filter. The
+snaps of the residential buildings to the roads are saved to snapfile and reused
+by the runs of the other amenity categories.
+
+With serviceareafile set, the area within walking distance of the amenity
+category is read from that GeoParquet file, or computed once and added to it, and
+a building is within walking distance when it intersects that area. With network
+set to True, the building is tested at the point nearest to the roads it is
+snapped to, which gives the same buildings as the network distance up to the
+road point spacing of ServiceArea.py.
+
+"""
+
+# Import modules
+import shapely
+
+from rdflib import Graph
+from Indicators import amenities, get_neighbourhoods, neighbourhood_name, add_walking_distance_schema, add_walking_distance_indicators
+from OverpassCache import OverpassCache
+from OverpassScheduler import OverpassScheduler
+from OverpassQL import CountingOverpass, bounding_box_query
+from NetworkDistance import load_roads, RoadGraph, snap_to_links, network_amenity_distance
+from ServiceArea import service_areas, service_area_near, access_points
+from Geometry import bounding_box, project
+from SpatialJoin import residentialfilters, load_features, element_geometries, building_membership, around_geometries, nearest_amenity_distance, walking_distance_counts
+
+# Create RDF graph
+g = Graph()
+
+# Initialize variables
+amenity = "Park"
+walkdistances = ["400"]
+buildingfile = "residential.geojson"
+buildingindicators = True
+source = "geojson"
+network = False
+roadfile = "ORN_ROAD_NET_ELEMENT.shp"
+snapfile = "ResidentialBuildingSnaps.npz"
+serviceareafile = None
+
+# The longest walking distance the amenities are searched for
+maxdistance = max(float(walkdistance) for walkdistance in walkdistances)
+
+# Get the neighborhood polygons
+df = get_neighbourhoods()
+neighbourhoods = shapely.from_wkt(df["coordinates"].to_numpy())
+
+# Get the residential buildings and the amenities
+if source == "overpass":
+    api = OverpassScheduler(CountingOverpass(cache=OverpassCache()))
+    buildingids, buildings = element_geometries(api.query(bounding_box_query(bounding_box(neighbourhoods), residentialfilters)).elements)
+    amenityids, amenitygeometries = element_geometries(api.query(bounding_box_query(bounding_box(neighbourhoods, maxdistance), amenities[amenity]["filters"])).elements)
+    print(api.summary())
+else:
+    buildingids, buildings = load_features([buildingfile], residentialfilters)
+    amenityids, amenitygeometries = load_features(amenities[amenity]["files"], amenities[amenity]["filters"])
+
+# Project the geometries to metres
+neighbourhoods = project(neighbourhoods)
+buildings = project(buildings)
+amenitygeometries = project(amenitygeometries)
+
+# Find the residential buildings of every neighborhood
+membership = building_membership(neighbourhoods, buildings)
+
+# Compute the distance from every building to the nearest amenity once
+graph = RoadGraph.from_roads(load_roads(roadfile)) if network else None
+if serviceareafile is not None:
+    areas = service_areas(serviceareafile, [amenity], walkdistances, graph)
+    if network:
+        buildings = access_points(graph, buildings, snap_to_links(graph, buildings, snapfile))
+    else:
+        buildings = around_geometries(buildings)
+elif network:
+    buildingsnaps = snap_to_links(graph, buildings, snapfile)
+    distances = network_amenity_distance(graph, buildings, amenitygeometries, maxdistance, buildingsnaps)
+else:
+    # Measure between the rings of the polygons, as the Overpass around filter does
+    distances = nearest_amenity_distance(around_geometries(buildings), around_geometries(amenitygeometries), maxdistance)
+
+for walkdistance in walkdistances:
+
+    # Count the residential buildings of every neighborhood and the ones within
+    # walking distance of the amenity
+    if serviceareafile is not None:
+        near = service_area_near(buildings, areas[(amenity, walkdistance)])
+    else:
+        near = distances <= float(walkdistance)
+    buildingtotals, walkingdistancetotals = walking_distance_counts(membership, near, len(df))
+
+    # Generates triples that only need to be generated once
+    add_walking_distance_schema(g, amenity, walkdistance, buildingindicators)
+
+    # Generates indicator triples for each neighborhood
+    for n in range(len(df)):
+        neighbourhood = neighbourhood_name(df.iloc[n]["area"])
+        add_walking_distance_indicators(g, neighbourhood, amenity, walkdistance, buildingtotals[n], walkingdistancetotals[n], buildingindicators)
+        print(neighbourhood)
+        print(buildingtotals[n])
+        print(walkingdistancetotals[n])
+
+# Export the RDF graph as a .ttl file
+filename = amenity + "WalkingDistance" + ".ttl"
+g.serialize(destination=filename)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+"""
+MapAmenities.py
+
+Description: This is a Python program that generates RDF triples for all the
+OpenStreetMap amenity categories of AmenityMapping.py in one run. Each GeoJSON
+file is read once, and every feature is passed to the compiled mapping of each
+category that reads the file, so school.geojson feeds both the schools and the
+kindergartens. The triples of each category are written to the .ttl file named
+in its mapping with TripleSink.py as the features are mapped, so they are not
+held in memory.
+
+The features are streamed from the files with GeoJSONStream.py in batches of
+batchsize features, whose geometries are converted in bulk, so the memory used
+for the input does not grow with the size of the files.
+
+"""
+
+# Import modules
+import shapely
+import numpy as np
+
+from AmenityMapping import mappings, add_schema, compile_mapping, feature_matches
+from Geometry import area
+from GeoJSONStream import iter_features, iter_batches
+from TripleSink import TripleSink
+
+# Initialize variables
+mappingnames = list(mappings)
+batchsize = 1000
+
+# Open the output file and compile the mapping of each category
+sinks = {}
+sources = {}
+for name in mappingnames:
+    sinks[name] = TripleSink(mappings[name]["output"])
+    add_schema(sinks[name], mappings[name])
+    map_feature = compile_mapping(mappings[name], sinks[name])
+
+    # Group the mappings by the GeoJSON files they read
+    for filename, sourcefilters in mappings[name]["sources"].items():
+        sources.setdefault(filename, []).append((sourcefilters, map_feature, mappings[name].get("area", False)))
+
+# Generate triples for each feature of each file
+for filename, filemappings in sources.items():
+    computearea = any(hasarea for sourcefilters, map_feature, hasarea in filemappings)
+
+    for features in iter_batches(iter_features(filename), batchsize):
+        # Parse the geometry of every feature of the batch once and convert it in bulk
+        geometries = np.array([shapely.geometry.shape(element["geometry"]) for element in features], dtype=object)
+        wkts = shapely.to_wkt(geometries)
+        if computearea:
+            areas = area(geometries).tolist()
+        else:
+            areas = [None] * len(features)
+
+        for element, wkt, poly_area in zip(features, wkts, areas):
+            for sourcefilters, map_feature, hasarea in filemappings:
+                if feature_matches(sourcefilters, element["properties"]):
+                    map_feature(element, wkt, poly_area)
+
+# Close the .ttl file of each category
+for name in mappingnames:
+    sinks[name].close()
+    print(mappings[name]["output"] + ": " + str(sinks[name].count) + " triples")
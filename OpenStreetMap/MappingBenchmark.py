@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+MappingBenchmark.py
+
+Description: This is a Python program that times the extraction of the
+optional properties of the amenity mappings per feature. It compares reading
+every mapped tag in a try/except block, as the former per-amenity programs did,
+looking up every mapped tag with dict.get, and visiting only the tags present
+in the feature through the tag to predicate table, as AmenityMapping.py does.
+It also times the complete compiled mapping of a feature.
+
+"""
+
+# Import modules
+import json
+import time
+import shapely
+
+from rdflib import Graph, Literal
+from AmenityMapping import mappings, compile_mapping
+
+# Initialize variables
+benchmarks = [("restaurant.geojson", "Restaurant"), ("fastfood.geojson", "FastFood")]
+repeat = 20
+
+
+def try_except_properties(tags, table):
+    """
+    Reads every mapped tag of a feature, skipping missing tags with an exception.
+
+    Parameters:
+    tags (dict): The OpenStreetMap tags of the feature.
+    table (dict): The tag to predicate table of the mapping.
+
+    Returns:
+    list: The (predicate, literal) pairs of the feature.
+    """
+
+    pairs = []
+    for tag, predicate in table.items():
+        try:
+            pairs.append((predicate, Literal(tags[tag])))
+        except:
+            pass
+    return pairs
+
+
+def lookup_properties(tags, table):
+    """
+    Reads every mapped tag of a feature with dict.get.
+
+    Parameters:
+    tags (dict): The OpenStreetMap tags of the feature.
+    table (dict): The tag to predicate table of the mapping.
+
+    Returns:
+    list: The (predicate, literal) pairs of the feature.
+    """
+
+    pairs = []
+    for tag, predicate in table.items():
+        value = tags.get(tag)
+        if value is not None:
+            pairs.append((predicate, Literal(value)))
+    return pairs
+
+
+def present_properties(tags, table):
+    """
+    Visits only the tags of a feature, dispatching them through the table.
+
+    Parameters:
+    tags (dict): The OpenStreetMap tags of the feature.
+    table (dict): The tag to predicate table of the mapping.
+
+    Returns:
+    list: The (predicate, literal) pairs of the feature.
+    """
+
+    pairs = []
+    for tag, value in tags.items():
+        predicate = table.get(tag)
+        if predicate is not None and value is not None:
+            pairs.append((predicate, Literal(value)))
+    return pairs
+
+
+def time_per_feature(function, features):
+    """
+    Times a function over all the features, repeated.
+
+    Parameters:
+    function (function): The function of one feature.
+    features (list): The features.
+
+    Returns:
+    float: The best time per feature in microseconds.
+    """
+
+    best = float("inf")
+    for r in range(repeat):
+        start = time.perf_counter()
+        for element in features:
+            function(element)
+        best = min(best, time.perf_counter() - start)
+    return best / len(features) * 1e6
+
+
+for filename, name in benchmarks:
+    features = json.loads(open(filename, encoding='utf8').read())["features"]
+    table = mappings[name]["properties"]
+
+    # Check that the strategies extract the same properties
+    for element in features:
+        expected = sorted(try_except_properties(element["properties"], table))
+        assert sorted(lookup_properties(element["properties"], table)) == expected
+        assert sorted(present_properties(element["properties"], table)) == expected
+
+    tagcount = sum(len(element["properties"]) for element in features) / len(features)
+    mappedcount = sum(len(table.keys() & element["properties"].keys()) for element in features) / len(features)
+    print(filename + ": " + str(len(features)) + " features, " + str(round(tagcount, 1)) + " tags and "
+          + str(round(mappedcount, 1)) + " of " + str(len(table)) + " mapped tags per feature")
+
+    for label, strategy in [("try/except", try_except_properties), ("dict.get", lookup_properties), ("present tags", present_properties)]:
+        elapsed = time_per_feature(lambda element: strategy(element["properties"], table), features)
+        print("    " + label + ": " + str(round(elapsed, 2)) + " us per feature")
+
+    # Time the complete mapping of a feature, with its geometry already converted
+    wkts = dict(zip((element["id"] for element in features),
+                    shapely.to_wkt([shapely.geometry.shape(element["geometry"]) for element in features])))
+    map_feature = compile_mapping(mappings[name], Graph())
+    elapsed = time_per_feature(lambda element: map_feature(element, wkts[element["id"]]), features)
+    print("    compiled mapping: " + str(round(elapsed, 2)) + " us per feature")
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""
+NearestAmenityDistance.py
+
+Description: This is a Python program that generates, for every neighborhood
+and amenity category, the median and 90th percentile of the straight line
+distance from its residential buildings to the nearest amenity, as ISO 21972
+indicators. It uses the same neighborhoods and amenity categories as Overpass.py
+and the same GeoJSON extracts as LocalWalkingDistance.py.
+
+The geometries are projected to metres once and the nearest amenity of every
+building is found with a single bulk query of a Shapely STRtree of the amenities.
+An STRtree is used instead of a KD-tree of projected coordinates (e.g.
+scipy.spatial.cKDTree), which would need SciPy and reduce every building and
+amenity to one point: the STRtree query measures the distance between the
+actual geometries, so a building next to a large park is at the distance to the
+park's edge rather than to its centroid.
+
+"""
+
+# Import modules
+import numpy as np
+import shapely
+
+from rdflib import Graph
+from Indicators import amenities, get_neighbourhoods, neighbourhood_name, add_distance_schema, add_distance_indicators
+from Geometry import project
+from SpatialJoin import residentialfilters, load_features, building_membership, nearest_amenity_distance, neighbourhood_percentiles
+
+# Create RDF graph
+g = Graph()
+
+# Initialize variables
+amenitynames = list(amenities)
+buildingfile = "residential.geojson"
+statistics = {"Median": 50, "Percentile90": 90}
+
+# Get the neighborhood polygons and the residential buildings, projected to metres
+df = get_neighbourhoods()
+neighbourhoods = project(shapely.from_wkt(df["coordinates"].to_numpy()))
+buildingids, buildings = load_features([buildingfile], residentialfilters)
+buildings = project(buildings)
+
+# Find the residential buildings of every neighborhood once for all amenities
+membership = building_membership(neighbourhoods, buildings)
+
+for amenity in amenitynames:
+    amenityids, amenitygeometries = load_features(amenities[amenity]["files"], amenities[amenity]["filters"])
+    if len(amenitygeometries) == 0:
+        continue
+
+    # Compute the distance from every building to the nearest amenity
+    distances = nearest_amenity_distance(buildings, project(amenitygeometries))
+    percentiles = neighbourhood_percentiles(membership, distances, len(df), list(statistics.values()))
+
+    # Generates triples that only need to be generated once
+    add_distance_schema(g, amenity, list(statistics))
+
+    # Generates indicator triples for each neighborhood with residential buildings
+    for n in range(len(df)):
+        if np.isnan(percentiles[n][0]):
+            continue
+        neighbourhood = neighbourhood_name(df.iloc[n]["area"])
+        add_distance_indicators(g, neighbourhood, amenity, dict(zip(statistics, percentiles[n])))
+        print(neighbourhood)
+        print(percentiles[n])
+
+# Export the RDF graph as a .ttl file
+filename = "NearestAmenityDistance" + ".ttl"
+g.serialize(destination=filename)
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+"""
+NetworkDistance.py
+
+Description: This is a Python module that evaluates walking distance along the
+street network instead of in a straight line, so that rivers, rail corridors and
+highways without a crossing are no longer counted as walkable.
+
+The road network is read from the Ontario Road Network (ORN) road net elements
+in RoadNetwork/ORNELEM/ORN_ROAD_NET_ELEMENT.shp. Each element links the
+junctions FROM_JCT and TO_JCT and is LENGTH metres long. The elements are turned
+into a compressed sparse row (CSR) adjacency graph of the junctions, walkable in
+both directions, and a single Dijkstra search bounded by the walking distance is
+started from all the amenities at once, which gives the network distance from
+every junction to its nearest amenity in one sweep.
+
+Amenities and buildings are attached to the network at the nearest point of
+their nearest road link, found in bulk with a Shapely STRtree over the links.
+A snap is stored as the link index, the offset along the link and the straight
+line access distance in a NumPy structured array, which can be saved to disk so
+that the residential buildings are only snapped once for every amenity category.
+
+"""
+
+# Import modules
+import os
+import heapq
+import hashlib
+import numpy as np
+import shapely
+import geopandas as gpd
+
+from Geometry import metriccrs
+
+# Snap of a geometry to the road network: the index of the road link, the
+# distance in metres along the link from its FROM_JCT junction, and the straight
+# line distance in metres from the geometry to the link
+snapdtype = np.dtype([("link", np.int32), ("offset", np.float32), ("access", np.float32)])
+
+
+def load_roads(filename):
+    """
+    Loads the ORN road net elements that can be walked on.
+
+    Parameters:
+    filename (str): The ORN_ROAD_NET_ELEMENT shapefile.
+
+    Returns:
+    geopandas.GeoDataFrame: The road elements in the metric CRS, without ferry
+                            connections and elements missing a junction.
+    """
+
+    roads = gpd.read_file(filename)
+    roads = roads[(roads["ELEM_TYPE"] != "Ferry Connection") & roads["FROM_JCT"].notna() & roads["TO_JCT"].notna()]
+
+    return roads.to_crs(metriccrs).reset_index(drop=True)
+
+
+class RoadGraph:
+    """
+    Junction graph of the road network in compressed sparse row form.
+
+    Parameters:
+    fromjunctions (numpy.ndarray): The junction id at the start of each link.
+    tojunctions (numpy.ndarray): The junction id at the end of each link.
+    lengths (numpy.ndarray): The length of each link in metres.
+    points (numpy.ndarray): Optional Shapely points of the junctions, in the
+                            order of the sorted junction ids.
+    links (numpy.ndarray): Optional projected Shapely lines of the links.
+    """
+
+    def __init__(self, fromjunctions, tojunctions, lengths, points=None, links=None):
+        # Number the junctions from 0 and find the junctions of each link
+        self.junctionids, junctions = np.unique(np.concatenate((fromjunctions, tojunctions)), return_inverse=True)
+        self.source = junctions[:len(fromjunctions)]
+        self.target = junctions[len(fromjunctions):]
+        self.lengths = np.asarray(lengths, dtype=float)
+        self.points = points
+        self.links = links
+
+        # Every link can be walked in both directions
+        source = np.concatenate((self.source, self.target))
+        target = np.concatenate((self.target, self.source))
+        weights = np.concatenate((self.lengths, self.lengths))
+
+        order = np.argsort(source, kind="stable")
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(source, minlength=len(self.junctionids)))))
+        self.neighbours = target[order]
+        self.weights = weights[order]
+
+    @classmethod
+    def from_roads(cls, roads):
+        """
+        Builds the graph of the road elements returned by load_roads.
+
+        Parameters:
+        roads (geopandas.GeoDataFrame): The projected road elements.
+
+        Returns:
+        RoadGraph: The junction graph. Links without a LENGTH use the length of
+                   their geometry.
+        """
+
+        geometries = roads.geometry.to_numpy()
+        lengths = roads["LENGTH"].to_numpy(dtype=float)
+        lengths = np.where(np.isnan(lengths), shapely.length(geometries), lengths)
+
+        graph = cls(roads["FROM_JCT"].to_numpy(), roads["TO_JCT"].to_numpy(), lengths, links=geometries)
+
+        # Locate each junction at the end of one of its links
+        points = np.empty(len(graph.junctionids), dtype=object)
+        points[graph.source] = shapely.get_point(shapely.get_geometry(geometries, 0), 0)
+        points[graph.target] = shapely.get_point(shapely.get_geometry(geometries, -1), -1)
+        graph.points = points
+
+        return graph
+
+    def distances(self, nodes, offsets, maxdistance):
+        """
+        Computes the network distance from every junction to the nearest source
+        with a Dijkstra search started from all the sources at once.
+
+        Parameters:
+        nodes (numpy.ndarray): The junction index of each source.
+        offsets (numpy.ndarray): The distance already walked to reach the junction
+                                 of each source.
+        maxdistance (float): The distance at which the search stops.
+
+        Returns:
+        numpy.ndarray: The distance of every junction to the nearest source, or
+                       infinity if it is further than maxdistance.
+        """
+
+        indptr = self.indptr.tolist()
+        neighbours = self.neighbours.tolist()
+        weights = self.weights.tolist()
+        distance = [float("inf")] * len(self.junctionids)
+
+        heap = []
+        for node, offset in zip(np.asarray(nodes).tolist(), np.asarray(offsets, dtype=float).tolist()):
+            if offset <= maxdistance and offset < distance[node]:
+                distance[node] = offset
+                heap.append((offset, node))
+        heapq.heapify(heap)
+
+        while heap:
+            d, node = heapq.heappop(heap)
+            if d > distance[node]:
+                continue
+            for k in range(indptr[node], indptr[node + 1]):
+                neighbour = neighbours[k]
+                nd = d + weights[k]
+                if nd <= maxdistance and nd < distance[neighbour]:
+                    distance[neighbour] = nd
+                    heapq.heappush(heap, (nd, neighbour))
+
+        return np.array(distance)
+
+    def snap(self, geometries):
+        """
+        Attaches geometries to the nearest point of their nearest road link.
+
+        Parameters:
+        geometries (numpy.ndarray): Projected Shapely geometries.
+
+        Returns:
+        numpy.ndarray: One snapdtype record per geometry.
+        """
+
+        tree = shapely.STRtree(self.links)
+        (geometryidx, linkidx), access = tree.query_nearest(geometries, return_distance=True, all_matches=False)
+
+        # Locate the point of the link closest to the geometry, as a fraction of
+        # the link geometry scaled to the link length of the graph
+        points = shapely.get_point(shapely.shortest_line(geometries[geometryidx], self.links[linkidx]), 1)
+        fractions = shapely.line_locate_point(self.links[linkidx], points, normalized=True)
+
+        snaps = np.zeros(len(geometries), dtype=snapdtype)
+        snaps["link"][geometryidx] = linkidx
+        snaps["offset"][geometryidx] = fractions * self.lengths[linkidx]
+        snaps["access"][geometryidx] = access
+
+        return snaps
+
+    def key(self, geometries):
+        """
+        Computes a key that changes with the road links or the geometries.
+
+        Parameters:
+        geometries (numpy.ndarray): Projected Shapely geometries.
+
+        Returns:
+        str: The hexadecimal SHA-256 hash of the links and geometries.
+        """
+
+        key = hashlib.sha256()
+        for wkb in shapely.to_wkb(self.links):
+            key.update(wkb)
+        key.update(self.lengths.tobytes())
+        for wkb in shapely.to_wkb(geometries):
+            key.update(wkb)
+
+        return key.hexdigest()
+
+
+def snap_to_links(graph, geometries, cachefile=None):
+    """
+    Snaps geometries to the road network, reusing the snaps saved by a previous
+    run if the road links and geometries have not changed.
+
+    Parameters:
+    graph (RoadGraph): The road network.
+    geometries (numpy.ndarray): Projected Shapely geometries.
+    cachefile (str): Optional .npz file the snaps are read from and saved to.
+
+    Returns:
+    numpy.ndarray: One snapdtype record per geometry.
+    """
+
+    if cachefile is None:
+        return graph.snap(geometries)
+
+    key = graph.key(geometries)
+    if os.path.exists(cachefile):
+        with np.load(cachefile) as cache:
+            if str(cache["key"]) == key:
+                return cache["snaps"]
+
+    snaps = graph.snap(geometries)
+    np.savez(cachefile, key=key, snaps=snaps)
+
+    return snaps
+
+
+def amenity_distances(graph, amenities, distance):
+    """
+    Computes the network distance from every junction to the nearest amenity.
+
+    Parameters:
+    graph (RoadGraph): The road network.
+    amenities (numpy.ndarray): Projected amenity geometries.
+    distance (float): The walking distance in metres at which the search stops.
+
+    Returns:
+    tuple: The distance of every junction to the nearest amenity, infinity if
+           it is further than the walking distance, and the snaps of the amenities.
+    """
+
+    # Start from both ends of the link of every amenity and from the junctions
+    # inside large amenities such as parks
+    amenitysnaps = graph.snap(amenities)
+    links = amenitysnaps["link"]
+    access = amenitysnaps["access"].astype(float)
+    offsets = amenitysnaps["offset"].astype(float)
+    inside = shapely.STRtree(graph.points).query(amenities, predicate="intersects")[1]
+
+    nodes = np.concatenate((graph.source[links], graph.target[links], inside))
+    starts = np.concatenate((access + offsets, access + graph.lengths[links] - offsets, np.zeros(len(inside))))
+
+    return graph.distances(nodes, starts, distance), amenitysnaps
+
+
+def network_amenity_distance(graph, buildings, amenities, maxdistance, buildingsnaps=None):
+    """
+    Computes the walking distance along the road network from every building to
+    its nearest amenity.
+
+    Parameters:
+    graph (RoadGraph): The road network.
+    buildings (numpy.ndarray): Projected building geometries.
+    amenities (numpy.ndarray): Projected amenity geometries.
+    maxdistance (float): The walking distance in metres at which the search stops.
+    buildingsnaps (numpy.ndarray): Optional snaps of the buildings from snap_to_links.
+
+    Returns:
+    numpy.ndarray: The walking distance in metres of every building to the
+                   nearest amenity, or infinity if it is further than maxdistance.
+    """
+
+    if len(amenities) == 0:
+        return np.full(len(buildings), np.inf)
+    if buildingsnaps is None:
+        buildingsnaps = graph.snap(buildings)
+
+    junctiondistances, amenitysnaps = amenity_distances(graph, amenities, maxdistance)
+
+    # Walk from the building to either end of its link
+    links = buildingsnaps["link"]
+    offsets = buildingsnaps["offset"].astype(float)
+    walk = np.minimum(junctiondistances[graph.source[links]] + offsets,
+                      junctiondistances[graph.target[links]] + graph.lengths[links] - offsets)
+
+    # Walk along the link directly when the building and an amenity share it
+    order = np.argsort(amenitysnaps["link"], kind="stable")
+    sortedlinks = amenitysnaps["link"][order]
+    first = np.searchsorted(sortedlinks, links, side="left")
+    last = np.searchsorted(sortedlinks, links, side="right")
+    for i in np.flatnonzero(last > first):
+        shared = order[first[i]:last[i]]
+        walk[i] = min(walk[i], np.min(np.abs(amenitysnaps["offset"][shared] - offsets[i]) + amenitysnaps["access"][shared]))
+
+    walk = walk + buildingsnaps["access"]
+    walk[walk > maxdistance] = np.inf
+
+    return walk
+
+
+def network_near_amenity(graph, buildings, amenities, distance, buildingsnaps=None):
+    """
+    Flags the buildings within a walking distance of any amenity along the road
+    network.
+
+    Parameters:
+    graph (RoadGraph): The road network.
+    buildings (numpy.ndarray): Projected building geometries.
+    amenities (numpy.ndarray): Projected amenity geometries.
+    distance (float): The walking distance in metres.
+    buildingsnaps (numpy.ndarray): Optional snaps of the buildings from snap_to_links.
+
+    Returns:
+    numpy.ndarray: A boolean array with one entry per building.
+    """
+
+    return network_amenity_distance(graph, buildings, amenities, distance, buildingsnaps) <= distance
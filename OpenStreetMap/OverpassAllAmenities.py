@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassAllAmenities.py
+
+Description: This is a Python program that generates the neighborhood walking
+distance indicators for every amenity category in a single run using
+OpenStreetMap data. The residential buildings of each neighborhood are
+retrieved once per Overpass query and evaluated against all amenity tags,
+instead of once per amenity as in Overpass.py, OverpassSchool.py, etc.
+
+"""
+
+# Import modules
+import shapely
+
+from concurrent.futures import ThreadPoolExecutor
+from rdflib import Graph
+from Checkpoint import Checkpoint
+from Indicators import amenities, get_neighbourhoods, neighbourhood_name, add_walking_distance_schema, add_walking_distance_indicators
+from OverpassCache import OverpassCache
+from OverpassScheduler import OverpassScheduler
+from OverpassQL import CountingOverpass, neighbourhood_filters, multi_amenity_query, concurrency_limit
+from Geometry import simplify
+
+# Declare OpenStreetMap Overpass API
+api = OverpassScheduler(CountingOverpass(cache=OverpassCache()))
+
+# Initialize variables
+amenitynames = list(amenities)
+walkdistance = "400"
+workers = 2
+resume = True
+
+# Simplification tolerance in metres and number of decimals of the neighborhood
+# polygons sent to Overpass (0 and None send them unchanged)
+tolerance = 0
+precision = None
+
+# The amenities whose graphs also hold the NumberOfResidentialBuildings indicator,
+# as the files written by Overpass.py and OverpassSchool.py do
+buildingamenities = {"Park", "School"}
+
+# Create one RDF graph per amenity
+graphs = {amenity: Graph() for amenity in amenitynames}
+
+# Save query results as a Pandas DataFrame object
+df = get_neighbourhoods()
+
+# Open the checkpoint of completed neighborhoods
+checkpoint = Checkpoint("AllAmenitiesWalkingDistance" + walkdistance + ".jsonl", resume)
+
+# Generates triples that only need to be generated once
+for amenity in amenitynames:
+    add_walking_distance_schema(graphs[amenity], amenity, walkdistance, amenity in buildingamenities)
+
+# Counts the residential buildings of a neighborhood and the ones within
+# walking distance of each amenity
+def count_neighbourhood(n):
+
+    # Convert the WKT polygon coordinates to a Shapely Polygon or MultiPolygon
+    poly = shapely.from_wkt(df.iloc[n]["coordinates"])
+    if tolerance > 0:
+        poly = simplify(poly, tolerance)
+
+    query = multi_amenity_query(neighbourhood_filters(poly, precision), amenitynames, walkdistance)
+
+    # Reuse the totals of a neighborhood completed by a previous run with the same query
+    area = df.iloc[n]["area"]
+    totals = checkpoint.get(area, query)
+    if totals is not None:
+        return totals
+
+    # Use OpenStreetMap's Overpass API to count the residential buildings of all
+    # the polygons of the neighborhood and the ones within walking distance of
+    # each amenity in a single query
+    result = api.query(query)
+
+    buildingtotal = result.counts[0]
+    walkingdistancetotals = dict(zip(amenitynames, result.counts[1:]))
+
+    # Save the totals as soon as the neighborhood is completed
+    checkpoint.record(area, (buildingtotal, walkingdistancetotals), query)
+
+    return buildingtotal, walkingdistancetotals
+
+# Query the neighborhoods concurrently without exceeding the Overpass query slots
+workers = concurrency_limit(api, workers)
+with ThreadPoolExecutor(max_workers=workers) as executor:
+    totals = list(executor.map(count_neighbourhood, range(len(df))))
+checkpoint.close()
+
+# Iterate for each neighborhood in the query result
+for n in range(len(df)):
+    buildingtotal, walkingdistancetotals = totals[n]
+
+    # Generates indicator triples for the current neighborhood
+    neighbourhood = neighbourhood_name(df.iloc[n]["area"])
+    for amenity in amenitynames:
+        add_walking_distance_indicators(graphs[amenity], neighbourhood, amenity, walkdistance, buildingtotal, walkingdistancetotals[amenity], amenity in buildingamenities)
+    print(neighbourhood)
+    print(n)
+
+# Print the Overpass query statistics
+print(api.summary())
+
+# Export the RDF graphs as .ttl files
+for amenity in amenitynames:
+    filename = amenity + "WalkingDistance" + ".ttl"
+    graphs[amenity].serialize(destination=filename)
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassBenchmark.py
+
+Description: This is a Python program that replays a full Toronto walking
+distance indicator run against the local Overpass API stand-in of
+OverpassServer.py and reports the number of queries per second and the end to
+end time, so that changes to the queries can be timed reproducibly without the
+public Overpass API.
+
+The server loads residential.geojson and the amenity GeoJSON extracts listed in
+Indicators.py. The neighborhoods are read from the City Digital Twin, or, on a
+machine without network access, from neighbourhoodfile, a CSV file with the
+"area" and "coordinates" columns of the neighborhood query (saved once with
+get_neighbourhoods().to_csv(neighbourhoodfile, index=False)).
+
+"""
+
+# Import modules
+import time
+import pandas
+import shapely
+
+from concurrent.futures import ThreadPoolExecutor
+from rdflib import Graph
+from Indicators import amenities, get_neighbourhoods, neighbourhood_name, add_walking_distance_schema, add_walking_distance_indicators
+from OverpassScheduler import OverpassScheduler
+from OverpassServer import start_server
+from OverpassQL import CountingOverpass, neighbourhood_filters, walking_distance_query
+
+# Initialize variables
+amenitynames = list(amenities)
+walkdistance = "400"
+buildingfile = "residential.geojson"
+neighbourhoodfile = None
+workers = 4
+
+# Get the neighborhood polygons
+if neighbourhoodfile is None:
+    df = get_neighbourhoods()
+else:
+    df = pandas.read_csv(neighbourhoodfile)
+polylists = [neighbourhood_filters(shapely.from_wkt(coordinates)) for coordinates in df["coordinates"]]
+
+# Start the local Overpass API without a cache, so that every query is evaluated
+filenames = [buildingfile] + sorted(set(filename for amenity in amenitynames for filename in amenities[amenity]["files"]))
+start = time.perf_counter()
+server = start_server(filenames)
+print("Loaded " + str(len(server.database.tags)) + " features in " + str(round(time.perf_counter() - start, 1)) + "s")
+
+api = OverpassScheduler(CountingOverpass(url=server.url))
+
+# Replay the run of each amenity program
+start = time.perf_counter()
+
+for amenity in amenitynames:
+    amenitystart = time.perf_counter()
+    g = Graph()
+
+    def count_neighbourhood(n):
+        result = api.query(walking_distance_query(polylists[n], amenities[amenity]["filters"], walkdistance))
+        return result.counts[0], result.counts[1]
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        totals = list(executor.map(count_neighbourhood, range(len(df))))
+
+    add_walking_distance_schema(g, amenity, walkdistance)
+    for n in range(len(df)):
+        add_walking_distance_indicators(g, neighbourhood_name(df.iloc[n]["area"]), amenity, walkdistance, totals[n][0], totals[n][1])
+    g.serialize(format="turtle")
+
+    print(amenity + ": " + str(len(df)) + " neighborhoods in " + str(round(time.perf_counter() - amenitystart, 2)) + "s")
+
+elapsed = time.perf_counter() - start
+
+# Print the benchmark results
+print("End to end: " + str(round(elapsed, 2)) + "s")
+print("Queries per second: " + str(round(server.queries / elapsed, 1)))
+print(api.summary())
+
+server.shutdown()
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassCache.py
+
+Description: This is a Python module that stores Overpass API responses on disk
+so that reruns of the walking distance indicator programs, including restarts
+after a crash, read the neighborhoods that were already queried from disk
+instead of downloading them again.
+
+Responses are stored under the SHA-256 hash of the normalized Overpass QL query,
+which contains the neighborhood polygon, the tags and the walking distance.
+Entries expire after a time to live counted from when they were written, which
+is the modification time of their file, and the least recently used entries,
+by the access time of their file, are removed when the cache grows past its
+maximum size.
+
+"""
+
+# Import modules
+import os
+import time
+import hashlib
+import threading
+
+
+class OverpassCache:
+    """
+    On-disk cache of raw Overpass API responses keyed by query.
+
+    Parameters:
+    directory (str): The directory the responses are stored in.
+    ttl (float): The number of seconds a response stays valid.
+    maxsize (int): The maximum total size of the stored responses in bytes.
+    """
+
+    def __init__(self, directory="OverpassCache", ttl=30 * 24 * 3600, maxsize=1024 ** 3):
+        self.directory = directory
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        # Total the size of the responses already stored
+        self.size = 0
+        for path in self.paths():
+            self.size += os.path.getsize(path)
+
+    @staticmethod
+    def normalize(query):
+        """
+        Normalizes a query so that differences in indentation and blank lines do
+        not change its key.
+
+        Parameters:
+        query (str or bytes): The Overpass QL query.
+
+        Returns:
+        str: The query with every line stripped and blank lines removed.
+        """
+
+        if isinstance(query, bytes):
+            query = query.decode("utf-8")
+
+        return "\n".join(line.strip() for line in query.splitlines() if line.strip())
+
+    def key(self, query):
+        """
+        Computes the key of a query.
+
+        Parameters:
+        query (str or bytes): The Overpass QL query.
+
+        Returns:
+        str: The hexadecimal SHA-256 hash of the normalized query.
+        """
+
+        return hashlib.sha256(self.normalize(query).encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def paths(self):
+        for root, dirs, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+
+    def get(self, query):
+        """
+        Reads the stored response of a query.
+
+        Parameters:
+        query (str or bytes): The Overpass QL query.
+
+        Returns:
+        bytes or None: The raw response, or None if the query is not cached or
+                       its response has expired.
+        """
+
+        path = self.path(self.key(query))
+
+        with self.lock:
+            try:
+                modified = os.path.getmtime(path)
+            except FileNotFoundError:
+                return None
+
+            # Remove the response if it has expired
+            if time.time() - modified > self.ttl:
+                self.remove(path)
+                return None
+
+            with open(path, "rb") as f:
+                response = f.read()
+
+            # Mark the response as recently used, keeping the time it was written
+            os.utime(path, (time.time(), modified))
+
+        return response
+
+    def put(self, query, response):
+        """
+        Stores the response of a query and evicts the least recently used
+        responses if the cache is larger than its maximum size.
+
+        Parameters:
+        query (str or bytes): The Overpass QL query.
+        response (bytes): The raw response returned by the Overpass API.
+        """
+
+        path = self.path(self.key(query))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with self.lock:
+            if os.path.exists(path):
+                self.size -= os.path.getsize(path)
+
+            # Write to a temporary file first so a crash never leaves a partial response
+            temporary = path + ".tmp"
+            with open(temporary, "wb") as f:
+                f.write(response)
+            os.replace(temporary, path)
+            self.size += len(response)
+
+            if self.size > self.maxsize:
+                self.evict()
+
+    def discard(self, query):
+        """
+        Removes the stored response of a query, if there is one.
+
+        Parameters:
+        query (str or bytes): The Overpass QL query.
+        """
+
+        with self.lock:
+            self.remove(self.path(self.key(query)))
+
+    def remove(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except FileNotFoundError:
+            return
+        self.size -= size
+
+    def evict(self):
+        # Remove responses from the least recently used until the cache fits
+        for path in sorted(self.paths(), key=os.path.getatime):
+            if self.size <= self.maxsize:
+                break
+            self.remove(path)
+
+    def clear(self):
+        """
+        Removes every stored response.
+        """
+
+        with self.lock:
+            for path in list(self.paths()):
+                self.remove(path)
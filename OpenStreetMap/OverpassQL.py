@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassQL.py
+
+Description: This is a Python module that builds the Overpass QL queries used by
+the neighborhood walking distance indicator programs and reads the element
+counts that the Overpass API returns for "out count" statements.
+
+"""
+
+# Import modules
+import re
+import json
+import overpy
+import shapely
+
+from decimal import Decimal
+from urllib.error import HTTPError
+from urllib.request import urlopen
+from Indicators import amenities, residentialtags
+
+
+def polygon_filter(polygon, precision=None):
+    """
+    Converts a polygon into the coordinate list of an Overpass poly: filter.
+
+    Parameters:
+    polygon (shapely.Polygon): A polygon with longitude/latitude coordinates.
+    precision (int): Optional number of decimals the coordinates are rounded to.
+                     Six decimals are about 0.1 m, seven about 1 cm.
+
+    Returns:
+    str: The "lat lon lat lon ..." pairs of the exterior ring of the polygon.
+    """
+
+    # Extract the x and y coordinates of the polygon
+    xx, yy = polygon.exterior.coords.xy
+    x = xx.tolist()
+    y = yy.tolist()
+
+    # Round the coordinates, dropping vertices that become duplicates
+    if precision is not None:
+        x = [round(value, precision) for value in x]
+        y = [round(value, precision) for value in y]
+        pairs = [(x[0], y[0])]
+        for i in range(1, len(x)):
+            if (x[i], y[i]) != pairs[-1]:
+                pairs.append((x[i], y[i]))
+        x = [pair[0] for pair in pairs]
+        y = [pair[1] for pair in pairs]
+
+    # Use the x and y coordinates to creates a list of xy coordinate pairs
+    polylist = ""
+
+    for i in range(len(x)):
+        polylist += str(y[i]) + " " + str(x[i]) + " "
+
+    return polylist.rstrip()
+
+
+def neighbourhood_filters(neighbourhood, precision=None):
+    """
+    Converts a neighborhood into the coordinate lists of the poly: filters of
+    the polygons that comprise it.
+
+    Parameters:
+    neighbourhood (shapely.Polygon or shapely.MultiPolygon): The neighborhood with
+                                                             longitude/latitude coordinates.
+    precision (int): Optional number of decimals the coordinates are rounded to.
+
+    Returns:
+    list: One coordinate list from polygon_filter per polygon.
+    """
+
+    return [polygon_filter(polygon, precision) for polygon in shapely.get_parts(neighbourhood)]
+
+
+def filter_ql(conditions):
+    """
+    Converts one amenity filter into Overpass QL tag filters.
+
+    Parameters:
+    conditions (list): The (key, operator, value) conditions of the filter.
+
+    Returns:
+    str: The tag filters, e.g. '[amenity=school]["isced:level"~"0"]'.
+    """
+
+    ql = ""
+    for key, operator, value in conditions:
+        if operator == "=":
+            ql += "[" + key + "=" + value + "]"
+        else:
+            ql += "[\"" + key + "\"" + operator + "\"" + value + "\"]"
+
+    return ql
+
+
+def residential_buildings_ql(polylists):
+    """
+    Builds the statement that collects the residential buildings of a
+    neighborhood into the .buildings set.
+
+    Parameters:
+    polylists (list): The coordinate lists from neighbourhood_filters. A building
+                      inside several polygons of a MultiPolygon is only added
+                      once, since the union removes duplicate elements.
+
+    Returns:
+    str: The Overpass QL union statement.
+    """
+
+    ql = "(\n"
+    for polylist in polylists:
+        for tag in residentialtags:
+            ql += "  nwr[building=" + tag + "](poly:\"" + polylist + "\");\n"
+    ql += ")->.buildings;\n"
+
+    return ql
+
+
+def walking_distance_ql(filters, walkdistance):
+    """
+    Builds the statements that count the buildings of the .buildings set that
+    are within walking distance of an amenity.
+
+    Parameters:
+    filters (list): The amenity filters, as defined in Indicators.py.
+    walkdistance (str): The walking distance in metres.
+
+    Returns:
+    str: The Overpass QL statements, ending with an "out count" statement.
+    """
+
+    ql = "(\n"
+    for conditions in filters:
+        ql += "  nwr" + filter_ql(conditions) + "(around.buildings:" + walkdistance + ");\n"
+    ql += ")->.amenity;\n"
+    ql += "(\n  nwr.buildings(around.amenity:" + walkdistance + ");\n)->.buildingsNearAmenity;\n"
+    ql += ".buildingsNearAmenity out count;\n"
+
+    return ql
+
+
+def walking_distance_query(polylists, filters, walkdistance):
+    """
+    Builds one query that counts the residential buildings of a neighborhood and
+    the ones within walking distance of an amenity.
+
+    Parameters:
+    polylists (list): The coordinate lists from neighbourhood_filters.
+    filters (list): The amenity filters, as defined in Indicators.py.
+    walkdistance (str): The walking distance in metres.
+
+    Returns:
+    str: The Overpass QL query. Its result holds the building count followed by
+         the walking distance count.
+    """
+
+    ql = "[out:json];\n"
+    ql += residential_buildings_ql(polylists)
+    ql += ".buildings out count;\n"
+    ql += walking_distance_ql(filters, walkdistance)
+
+    return ql
+
+
+def multi_amenity_query(polylists, amenitynames, walkdistance):
+    """
+    Builds one query that retrieves the residential buildings of a neighborhood
+    once and counts the buildings within walking distance of every amenity category.
+
+    Parameters:
+    polylists (list): The coordinate lists from neighbourhood_filters.
+    amenitynames (list): The amenity categories, as named in Indicators.py.
+    walkdistance (str): The walking distance in metres.
+
+    Returns:
+    str: The Overpass QL query. Its result holds one count for the buildings
+         followed by one count per amenity category, in the given order.
+    """
+
+    ql = "[out:json][timeout:900];\n"
+    ql += residential_buildings_ql(polylists)
+    ql += ".buildings out count;\n"
+    for amenity in amenitynames:
+        ql += walking_distance_ql(amenities[amenity]["filters"], walkdistance)
+
+    return ql
+
+
+def bounding_box_query(bbox, filters):
+    """
+    Builds one query that retrieves the geometry of every element matching the
+    filters inside a bounding box.
+
+    Parameters:
+    bbox (tuple): The (south, west, north, east) bounds in degrees.
+    filters (list): The filters, as defined in Indicators.py.
+
+    Returns:
+    str: The Overpass QL query. Its result holds the matching nodes, and the
+         ways and relations with their member coordinates ("out geom").
+    """
+
+    ql = "[out:json][timeout:900][maxsize:2000000000][bbox:" + ",".join(str(value) for value in bbox) + "];\n"
+    ql += "(\n"
+    for conditions in filters:
+        ql += "  nwr" + filter_ql(conditions) + ";\n"
+    ql += ");\n"
+    ql += "out geom;\n"
+
+    return ql
+
+
+def overpass_status(api):
+    """
+    Reads the status page of the Overpass API server, which reports the query
+    slots of the client.
+
+    Parameters:
+    api (overpy.Overpass): The Overpass API client.
+
+    Returns:
+    dict: The number of slots of the client ("ratelimit", 0 if unlimited), the
+          number of slots available now ("available") and the seconds until
+          each of the other slots becomes available ("waits").
+    """
+
+    url = api.url.rsplit("/", 1)[0] + "/status"
+    with urlopen(url) as f:
+        text = f.read().decode("utf-8", "replace")
+
+    ratelimit = re.search(r"Rate limit: (\d+)", text)
+    available = re.search(r"(\d+) slots? available now", text)
+    waits = [max(int(wait), 0) for wait in re.findall(r"in (-?\d+) seconds", text)]
+
+    return {
+        "ratelimit": int(ratelimit.group(1)) if ratelimit else 0,
+        "available": int(available.group(1)) if available else 0,
+        "waits": waits,
+    }
+
+
+def concurrency_limit(api, workers):
+    """
+    Limits the number of concurrent queries to the query slots of the client.
+
+    Parameters:
+    api (overpy.Overpass): The Overpass API client.
+    workers (int): The number of concurrent queries requested.
+
+    Returns:
+    int: The number of concurrent queries to use. If the status page cannot be
+         read, the requested number is used.
+    """
+
+    try:
+        ratelimit = overpass_status(api)["ratelimit"]
+    except (OSError, ValueError):
+        return workers
+
+    if ratelimit == 0:
+        return workers
+    return max(1, min(workers, ratelimit))
+
+
+class CountingOverpass(overpy.Overpass):
+    """
+    Overpass API client that also keeps the results of "out count" statements,
+    which overpy discards, in the counts attribute of the returned result, and
+    the raw JSON elements in the elements attribute.
+
+    Parameters:
+    url (str): Optional URL of the Overpass API interpreter.
+    cache (OverpassCache): Optional on-disk cache the responses are read from
+                           and written to.
+    """
+
+    def __init__(self, url=None, cache=None):
+        super().__init__(url=url)
+        self.cache = cache
+
+    def query(self, query):
+        """
+        Queries the Overpass API, or the cache if it holds the response.
+
+        Parameters:
+        query (str): The query in Overpass QL.
+
+        Returns:
+        overpy.Result: The parsed result, with the counts and elements attributes,
+                       and a cached attribute telling if it was read from the cache.
+        """
+
+        if self.cache is not None:
+            response = self.cache.get(query)
+            if response is not None:
+                try:
+                    result = self.parse_json(response)
+                except ValueError:
+                    # A stored response that does not parse is fetched again
+                    self.cache.discard(query)
+                else:
+                    result.cached = True
+                    return result
+
+        response = self.fetch(query)
+        result = self.parse_json(response)
+        result.cached = False
+
+        # Only responses that were read in full and parsed without a runtime
+        # error are cached, so a retried failure never leaves a partial entry
+        if self.cache is not None:
+            self.cache.put(query, response)
+
+        return result
+
+    def fetch(self, query):
+        """
+        Sends a query to the Overpass API.
+
+        Parameters:
+        query (str): The query in Overpass QL.
+
+        Returns:
+        bytes: The raw JSON response.
+
+        Raises:
+        overpy.exception.OverpassBadRequest: If the query has a syntax error.
+        overpy.exception.OverpassTooManyRequests: If no query slot is available.
+        overpy.exception.OverpassGatewayTimeout: If the server load is too high.
+        """
+
+        if not isinstance(query, bytes):
+            query = query.encode("utf-8")
+
+        try:
+            f = urlopen(self.url, query)
+        except HTTPError as e:
+            f = e
+
+        response = f.read()
+        f.close()
+
+        if f.code == 200:
+            content_type = f.getheader("Content-Type")
+            if content_type != "application/json":
+                raise overpy.exception.OverpassUnknownContentType(content_type)
+            return response
+
+        if f.code == 400:
+            msgs = []
+            for msg_raw in self._regex_extract_error_msg.finditer(response):
+                msgs.append(self._regex_remove_tag.sub(b"", msg_raw.group("msg")).decode("utf-8", "replace"))
+            raise overpy.exception.OverpassBadRequest(query, msgs=msgs)
+
+        if f.code == 429:
+            raise overpy.exception.OverpassTooManyRequests()
+
+        if f.code == 504:
+            raise overpy.exception.OverpassGatewayTimeout()
+
+        raise overpy.exception.OverpassUnknownHTTPStatusCode(f.code)
+
+    def parse_json(self, data, encoding="utf-8"):
+        """
+        Parses a JSON response, keeping the elements and counts that overpy
+        drops.
+
+        Parameters:
+        data (str or bytes): The raw JSON response.
+        encoding (str): The encoding of data if it is bytes.
+
+        Returns:
+        overpy.Result: The parsed result, with the raw elements in its elements
+                       attribute and the totals of the count elements in its
+                       counts attribute.
+
+        Raises:
+        overpy.exception.OverpassRuntimeError: If the response has a runtime error remark.
+        overpy.exception.OverpassRuntimeRemark: If the response has a runtime remark.
+        overpy.exception.OverpassUnknownError: If the remark is not recognized.
+        """
+
+        if isinstance(data, bytes):
+            data = data.decode(encoding)
+        data_parsed = json.loads(data, parse_float=Decimal)
+        if "remark" in data_parsed:
+            self._handle_remark_msg(msg=data_parsed.get("remark"))
+
+        result = overpy.Result.from_json(data_parsed, api=self)
+        result.elements = data_parsed.get("elements", [])
+        result.counts = [int(element["tags"]["total"]) for element in result.elements if element.get("type") == "count"]
+
+        return result
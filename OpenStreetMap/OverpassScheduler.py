@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassScheduler.py
+
+Description: This is a Python module that schedules the queries of the walking
+distance indicator programs on the Overpass API. Queries rejected because the
+client has no free slot wait until the server reports a slot as available,
+queries that fail because of server load or a network error are retried with
+exponential backoff and jitter, and queries with a syntax error fail at once
+instead of being retried forever. The latency of every query answered by the
+server is recorded, and the queries answered from the cache are counted apart.
+
+"""
+
+# Import modules
+import time
+import random
+import threading
+import http.client
+import overpy
+
+from OverpassQL import overpass_status
+
+# Failures worth retrying: server load, runtime errors such as timeouts or
+# running out of memory, unexpected responses, network errors, responses cut
+# off before the end (http.client.IncompleteRead) and responses that are not
+# valid JSON (json.JSONDecodeError is a ValueError)
+retryexceptions = (
+    overpy.exception.OverpassGatewayTimeout,
+    overpy.exception.OverpassRuntimeError,
+    overpy.exception.OverpassRuntimeRemark,
+    overpy.exception.OverpassUnknownHTTPStatusCode,
+    overpy.exception.OverpassUnknownContentType,
+    OSError,
+    http.client.HTTPException,
+    ValueError,
+)
+
+
+class OverpassScheduler:
+    """
+    Wraps an Overpass API client with rate limit aware retries.
+
+    Parameters:
+    api (CountingOverpass): The Overpass API client the queries are sent with.
+    maxretries (int): The number of times a query is retried before giving up.
+    basedelay (float): The backoff in seconds before the first retry.
+    maxdelay (float): The longest backoff in seconds.
+    """
+
+    def __init__(self, api, maxretries=10, basedelay=2, maxdelay=300):
+        self.api = api
+        self.url = api.url
+        self.maxretries = maxretries
+        self.basedelay = basedelay
+        self.maxdelay = maxdelay
+        self.latencies = []
+        self.cachehits = 0
+        self.retries = 0
+        self.lock = threading.Lock()
+
+    def backoff(self, attempt):
+        """
+        Computes the delay before a retry, with full jitter so that concurrent
+        workers do not retry at the same time.
+
+        Parameters:
+        attempt (int): The number of attempts made so far, starting at 0.
+
+        Returns:
+        float: The delay in seconds.
+        """
+
+        return random.uniform(0, min(self.maxdelay, self.basedelay * 2 ** attempt))
+
+    def slot_wait(self, attempt):
+        """
+        Computes the delay before a retry that was rejected for lack of a slot,
+        using the slot availability reported by the server.
+
+        Parameters:
+        attempt (int): The number of attempts made so far, starting at 0.
+
+        Returns:
+        float: The delay in seconds.
+        """
+
+        try:
+            status = overpass_status(self.api)
+        except (OSError, ValueError):
+            return self.backoff(attempt)
+
+        if status["available"] > 0:
+            return random.uniform(0, 1)
+        if status["waits"]:
+            return min(status["waits"]) + random.uniform(0, 1)
+        return self.backoff(attempt)
+
+    def query(self, query):
+        """
+        Sends a query, retrying it until it succeeds.
+
+        Parameters:
+        query (str): The query in Overpass QL.
+
+        Returns:
+        overpy.Result: The parsed result.
+
+        Raises:
+        overpy.exception.OverpassBadRequest: If the query has a syntax error.
+        overpy.exception.MaxRetriesReached: If every retry failed.
+        """
+
+        exceptions = []
+
+        for attempt in range(self.maxretries + 1):
+            start = time.perf_counter()
+            try:
+                result = self.api.query(query)
+            except (overpy.exception.OverpassTooManyRequests,) + retryexceptions as e:
+                exceptions.append(e)
+            else:
+                # Cache hits would bring the latencies of the server down
+                with self.lock:
+                    if getattr(result, "cached", False):
+                        self.cachehits += 1
+                    else:
+                        self.latencies.append(time.perf_counter() - start)
+                return result
+
+            # Give up without waiting after the last attempt
+            if attempt == self.maxretries:
+                break
+
+            if isinstance(exceptions[-1], overpy.exception.OverpassTooManyRequests):
+                delay = self.slot_wait(attempt)
+            else:
+                delay = self.backoff(attempt)
+
+            with self.lock:
+                self.retries += 1
+            print("Overpass query failed (" + type(exceptions[-1]).__name__ + "), retrying in " + str(round(delay, 1)) + " seconds")
+            time.sleep(delay)
+
+        raise overpy.exception.MaxRetriesReached(retry_count=self.maxretries, exceptions=exceptions)
+
+    def summary(self):
+        """
+        Summarizes the recorded query latencies.
+
+        Returns:
+        str: The number of queries answered by the server, cache hits and
+             retries, and the median, 95th percentile and total latency in
+             seconds of the queries answered by the server.
+        """
+
+        with self.lock:
+            latencies = sorted(self.latencies)
+            cachehits = self.cachehits
+            retries = self.retries
+
+        if not latencies:
+            return "0 queries, " + str(cachehits) + " cache hits, " + str(retries) + " retries"
+
+        median = latencies[len(latencies) // 2]
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+
+        return (str(len(latencies)) + " queries, " + str(cachehits) + " cache hits, " + str(retries) + " retries, median "
+                + str(round(median, 2)) + "s, p95 " + str(round(p95, 2)) + "s, total " + str(round(sum(latencies), 1)) + "s")
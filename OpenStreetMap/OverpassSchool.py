@@ -12,12 +12,18 @@ indicators for schools using OpenStreetMap data.
 """
 
 # Import modules
-import overpy
 import sparql_dataframe
 import shapely
 import rdflib
 
+from concurrent.futures import ThreadPoolExecutor
 from rdflib import Graph, Literal, XSD, RDF
+from Checkpoint import Checkpoint
+from Indicators import amenities
+from OverpassCache import OverpassCache
+from OverpassScheduler import OverpassScheduler
+from OverpassQL import CountingOverpass, neighbourhood_filters, walking_distance_query, concurrency_limit
+from Geometry import simplify
 
 # Declare namespaces
 cdt = rdflib.Namespace('http://ontology.eil.utoronto.ca/CDT#')
@@ -34,12 +40,19 @@ g = Graph()
 endpoint = "http://ec2-3-97-59-180.ca-central-1.compute.amazonaws.com:7200/repositories/CACensus"
 
 # Declare OpenStreetMap Overpass API
-api = overpy.Overpass()
+api = OverpassScheduler(CountingOverpass(cache=OverpassCache()))
 
 # Initialize variables
-tag = "amenity=school"
 amenity = "School"
 walkdistance = "400"
+filters = amenities[amenity]["filters"]
+workers = 2
+resume = True
+
+# Simplification tolerance in metres and number of decimals of the neighborhood
+# polygons sent to Overpass (0 and None send them unchanged)
+tolerance = 0
+precision = None
 
 # SPARQL query the City Digital Twin for neighborhood polygons
 q = """
@@ -60,237 +73,57 @@ WHERE{
 # Save query results as a Pandas DataFrame object
 df = sparql_dataframe.get(endpoint, q)
 
-# Iterate for each neighborhood in the query result
-for n in range(len(df)):
-    
-    # Initialize variables
-    walkingdistancetotal = 0
-    buildingtotal = 0
+# Open the checkpoint of completed neighborhoods
+checkpoint = Checkpoint(amenity + "WalkingDistance" + walkdistance + ".jsonl", resume)
+
+# Counts the residential buildings of a neighborhood and the ones within
+# walking distance of the amenity
+def count_neighbourhood(n):
     
     # Get the neighborhood polygon in WKT format from the query result
     neighbourhood_polygon = df.iloc[n]["coordinates"]
-    # Convert the WKT polygon coordinates to a Shapely Polygon
+    
+    # Convert the WKT polygon coordinates to a Shapely Polygon or MultiPolygon
     poly = shapely.from_wkt(neighbourhood_polygon)
+    if tolerance > 0:
+        poly = simplify(poly, tolerance)
+    
+    # Use the coordinates of every polygon that comprises the neighborhood to
+    # create lists of xy coordinate pairs
+    polylists = neighbourhood_filters(poly, precision)
+    
+    query = walking_distance_query(polylists, filters, walkdistance)
+    
+    # Reuse the totals of a neighborhood completed by a previous run with the same query
+    area = df.iloc[n]["area"]
+    totals = checkpoint.get(area, query)
+    if totals is not None:
+        return totals
+    
+    # Use OpenStreetMap's Overpass API to count the residential buildings and
+    # the ones within walking distance of the amenity in a single query
+    result = api.query(query)
+    
+    buildingtotal = result.counts[0]
+    walkingdistancetotal = result.counts[1]
+    print(buildingtotal)
+    print(walkingdistancetotal)
+
+    # Save the totals as soon as the neighborhood is completed
+    checkpoint.record(area, (buildingtotal, walkingdistancetotal), query)
+
+    return buildingtotal, walkingdistancetotal
+
+# Query the neighborhoods concurrently without exceeding the Overpass query slots
+workers = concurrency_limit(api, workers)
+with ThreadPoolExecutor(max_workers=workers) as executor:
+    totals = list(executor.map(count_neighbourhood, range(len(df))))
+checkpoint.close()
+
+# Iterate for each neighborhood in the query result
+for n in range(len(df)):
+    buildingtotal, walkingdistancetotal = totals[n]
     
-    # Check if polygon is a multipolygon
-    if isinstance(poly, shapely.MultiPolygon):
-        print("multipolygon")
-        
-        # Generates a list of polygons that comprise the multipolygon
-        polygons = list(poly.geoms)
-        
-        # Iterate for each polygon in the polygon list
-        for polygon in polygons:
-            
-            # Extract the x and y coordinates of the polygon
-            xx, yy = polygon.exterior.coords.xy
-            x = xx.tolist()
-            y = yy.tolist()
-            
-            # Use the x and y coordinates to creates a list of xy coordinate pairs
-            polylist = ""
-            
-            for i in range(len(x)):
-                polylist += str(y[i]) + " " + str(x[i]) + " "
-                
-            polylist = polylist.rstrip()
-            
-            # Use OpenStreetMap's Overpass API to query for the number of residential 
-            # buildings that are within walking distance of the amenity
-            walkingdistanceresult = api.query("""
-            [out:json];
-            
-            (
-            node[building=apartments](poly:\"""" + polylist + """\");
-            way[building=apartments](poly:\"""" + polylist + """\");
-            rel[building=apartments](poly:\"""" + polylist + """\");
-                                     
-            node[building=detached](poly:\"""" + polylist + """\");
-            way[building=detached](poly:\"""" + polylist + """\");
-            rel[building=detached](poly:\"""" + polylist + """\");
-            
-            node[building=house](poly:\"""" + polylist + """\");
-            way[building=house](poly:\"""" + polylist + """\");
-            rel[building=house](poly:\"""" + polylist + """\"); 
-            
-            node[building=semidetached_house](poly:\"""" + polylist + """\");
-            way[building=semidetached_house](poly:\"""" + polylist + """\");
-            rel[building=semidetached_house](poly:\"""" + polylist + """\");  
-                                             
-            node[building=terrace](poly:\"""" + polylist + """\");
-            way[building=terrace](poly:\"""" + polylist + """\");
-            rel[building=terrace](poly:\"""" + polylist + """\");  
-            
-            node[building=residential](poly:\"""" + polylist + """\");
-            way[building=residential](poly:\"""" + polylist + """\");
-            rel[building=residential](poly:\"""" + polylist + """\");                               
-            )->.buildings; 
-            
-            (
-              node[""" + tag + """](around.buildings:""" + walkdistance + """);
-              way[""" + tag + """](around.buildings:""" + walkdistance + """);
-              rel[""" + tag + """](around.buildings:""" + walkdistance + """);
-            )->.amenity; 
-            
-            (
-              node.buildings(around.amenity:""" + walkdistance + """);
-              way.buildings(around.amenity:""" + walkdistance + """);
-              rel.buildings(around.amenity:""" + walkdistance + """);
-            )->.buildingsNearAmenity; 
-            
-            .buildingsNearAmenity;
-            
-            out;
-                               """)
-            
-            # Use OpenStreetMap's Overpass API to query for the total number
-            # of residential buildings 
-            buildingresult = api.query("""
-            [out:json];
-            
-            (
-            node[building=apartments](poly:\"""" + polylist + """\");
-            way[building=apartments](poly:\"""" + polylist + """\");
-            rel[building=apartments](poly:\"""" + polylist + """\");
-                                     
-            node[building=detached](poly:\"""" + polylist + """\");
-            way[building=detached](poly:\"""" + polylist + """\");
-            rel[building=detached](poly:\"""" + polylist + """\");
-            
-            node[building=house](poly:\"""" + polylist + """\");
-            way[building=house](poly:\"""" + polylist + """\");
-            rel[building=house](poly:\"""" + polylist + """\"); 
-            
-            node[building=semidetached_house](poly:\"""" + polylist + """\");
-            way[building=semidetached_house](poly:\"""" + polylist + """\");
-            rel[building=semidetached_house](poly:\"""" + polylist + """\");  
-                                             
-            node[building=terrace](poly:\"""" + polylist + """\");
-            way[building=terrace](poly:\"""" + polylist + """\");
-            rel[building=terrace](poly:\"""" + polylist + """\");  
-            
-            node[building=residential](poly:\"""" + polylist + """\");
-            way[building=residential](poly:\"""" + polylist + """\");
-            rel[building=residential](poly:\"""" + polylist + """\");                               
-            )->.buildings;  
-            
-            .buildings;
-            
-            out;
-                               """)
-            
-            # Add the result of the queries to the current total
-            walkingdistancetotal += len(walkingdistanceresult.nodes) + len(walkingdistanceresult.ways) + len(walkingdistanceresult.relations)
-            buildingtotal +=  len(buildingresult.nodes) + len(buildingresult.ways) + len(buildingresult.relations)
-            print(buildingtotal)
-            print(walkingdistancetotal)
-            
-    else:
-        print("polygon")
-        
-        # Extract the x and y coordinates of the polygon
-        xx, yy = poly.exterior.coords.xy
-        x = xx.tolist()
-        y = yy.tolist()
-        
-        # Use the x and y coordinates to creates a list of xy coordinate pairs
-        polylist = ""
-        
-        for i in range(len(x)):
-            polylist += str(y[i]) + " " + str(x[i]) + " "
-            
-        polylist = polylist.rstrip()
-        
-        # Use OpenStreetMap's Overpass API to query for the number of residential 
-        # buildings that are within walking distance of the amenity
-        walkingdistanceresult = api.query("""
-        [out:json];
-        
-        (
-        node[building=apartments](poly:\"""" + polylist + """\");
-        way[building=apartments](poly:\"""" + polylist + """\");
-        rel[building=apartments](poly:\"""" + polylist + """\");
-                                 
-        node[building=detached](poly:\"""" + polylist + """\");
-        way[building=detached](poly:\"""" + polylist + """\");
-        rel[building=detached](poly:\"""" + polylist + """\");
-        
-        node[building=house](poly:\"""" + polylist + """\");
-        way[building=house](poly:\"""" + polylist + """\");
-        rel[building=house](poly:\"""" + polylist + """\"); 
-        
-        node[building=semidetached_house](poly:\"""" + polylist + """\");
-        way[building=semidetached_house](poly:\"""" + polylist + """\");
-        rel[building=semidetached_house](poly:\"""" + polylist + """\");  
-                                         
-        node[building=terrace](poly:\"""" + polylist + """\");
-        way[building=terrace](poly:\"""" + polylist + """\");
-        rel[building=terrace](poly:\"""" + polylist + """\");  
-        
-        node[building=residential](poly:\"""" + polylist + """\");
-        way[building=residential](poly:\"""" + polylist + """\");
-        rel[building=residential](poly:\"""" + polylist + """\");                               
-        )->.buildings; 
-        
-        (
-          node[""" + tag + """](around.buildings:""" + walkdistance + """);
-          way[""" + tag + """](around.buildings:""" + walkdistance + """);
-          rel[""" + tag + """](around.buildings:""" + walkdistance + """);
-        )->.amenity; 
-        
-        (
-          node.buildings(around.amenity:""" + walkdistance + """);
-          way.buildings(around.amenity:""" + walkdistance + """);
-          rel.buildings(around.amenity:""" + walkdistance + """);
-        )->.buildingsNearAmenity; 
-        
-        .buildingsNearAmenity;
-        
-        out;
-                           """)
-        
-        # Use OpenStreetMap's Overpass API to query for the total number
-        # of residential buildings 
-        buildingresult = api.query("""
-        [out:json];
-        
-        (
-        node[building=apartments](poly:\"""" + polylist + """\");
-        way[building=apartments](poly:\"""" + polylist + """\");
-        rel[building=apartments](poly:\"""" + polylist + """\");
-                                 
-        node[building=detached](poly:\"""" + polylist + """\");
-        way[building=detached](poly:\"""" + polylist + """\");
-        rel[building=detached](poly:\"""" + polylist + """\");
-        
-        node[building=house](poly:\"""" + polylist + """\");
-        way[building=house](poly:\"""" + polylist + """\");
-        rel[building=house](poly:\"""" + polylist + """\"); 
-        
-        node[building=semidetached_house](poly:\"""" + polylist + """\");
-        way[building=semidetached_house](poly:\"""" + polylist + """\");
-        rel[building=semidetached_house](poly:\"""" + polylist + """\");  
-                                         
-        node[building=terrace](poly:\"""" + polylist + """\");
-        way[building=terrace](poly:\"""" + polylist + """\");
-        rel[building=terrace](poly:\"""" + polylist + """\");  
-        
-        node[building=residential](poly:\"""" + polylist + """\");
-        way[building=residential](poly:\"""" + polylist + """\");
-        rel[building=residential](poly:\"""" + polylist + """\");                               
-        )->.buildings;  
-        
-        .buildings;
-        
-        out;
-                           """)
-        
-        # Add the result of the queries to the current total
-        walkingdistancetotal += len(walkingdistanceresult.nodes) + len(walkingdistanceresult.ways) + len(walkingdistanceresult.relations)
-        buildingtotal +=  len(buildingresult.nodes) + len(buildingresult.ways) + len(buildingresult.relations)
-        print(buildingtotal)
-        print(walkingdistancetotal)
-            
     # Initialize variables
     neighbourhood = df.iloc[n]["area"].removeprefix('http://ontology.eil.utoronto.ca/Toronto/Toronto#')
         
@@ -380,6 +213,9 @@ for n in range(len(df)):
     print(neighbourhood)
     print(n)
 
+# Print the Overpass query statistics
+print(api.summary())
+
 # Export the RDF graph as a .ttl file
 filename = amenity + "WalkingDistance" + ".ttl"
 g.serialize(destination=filename)
@@ -0,0 +1,455 @@
+# -*- coding: utf-8 -*-
+"""
+OverpassServer.py
+
+Description: This is a Python module that serves a local stand-in for the
+Overpass API from OpenStreetMap GeoJSON extracts, so that the walking distance
+indicator programs can be run and timed without the public Overpass API.
+
+Only the subset of Overpass QL used by these programs is supported:
+settings such as [out:json][timeout:900][bbox:s,w,n,e], node, way, relation and
+nwr queries with tag filters ([k=v], ["k"~"v"], ["k"!="v"], [k]), poly:, bbox
+and around.set: filters, input sets (nwr.set), unions, named sets (->.set) and
+the out, out geom and out count statements. The features are projected to a
+metric CRS once and indexed with a Shapely STRtree, so poly: filters and around
+distances are evaluated the same way as in SpatialJoin.py, with around
+distances measured to the rings of polygons as the Overpass API measures them
+to the segments of ways.
+
+"""
+
+# Import modules
+import re
+import json
+import threading
+import numpy as np
+import shapely
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+from Geometry import project
+from SpatialJoin import around_geometries
+
+# Element types of the query statements
+elementtypes = {"node": ("node",), "way": ("way",), "rel": ("relation",), "relation": ("relation",), "nwr": ("node", "way", "relation")}
+
+number = r"-?\d+(?:\.\d+)?"
+
+
+class QueryError(Exception):
+    """
+    Raised when a query uses Overpass QL this server does not support.
+    """
+
+
+class QueryParser:
+    """
+    Parses the supported subset of Overpass QL.
+
+    Parameters:
+    text (str): The query in Overpass QL.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.pos = 0
+
+    def skip(self):
+        # Skip whitespace and comments
+        while True:
+            m = re.compile(r"\s+|//[^\n]*|/\*.*?\*/", re.S).match(self.text, self.pos)
+            if not m or m.end() == self.pos:
+                return
+            self.pos = m.end()
+
+    def match(self, pattern):
+        self.skip()
+        m = re.compile(pattern).match(self.text, self.pos)
+        if m:
+            self.pos = m.end()
+        return m
+
+    def expect(self, pattern, description):
+        m = self.match(pattern)
+        if not m:
+            line = self.text.count("\n", 0, self.pos) + 1
+            raise QueryError("line " + str(line) + ": parse error: " + description + " expected")
+        return m
+
+    @staticmethod
+    def unquote(value):
+        if value.startswith("\""):
+            return re.sub(r"\\(.)", r"\1", value[1:-1])
+        return value
+
+    def parse(self):
+        """
+        Parses the query.
+
+        Returns:
+        tuple: The settings as a dictionary and the list of statements.
+        """
+
+        settings = {}
+        while self.match(r"\["):
+            m = self.expect(r"(\w+)\s*:\s*([^\]]*)\]", "setting")
+            settings[m.group(1)] = m.group(2).strip()
+        if settings:
+            self.expect(r";", "';'")
+
+        statements = []
+        self.skip()
+        while self.pos < len(self.text):
+            statements.append(self.statement())
+            self.skip()
+
+        return settings, statements
+
+    def output(self):
+        m = self.match(r"->\s*\.(\w+)")
+        return m.group(1) if m else "_"
+
+    def statement(self):
+        # Union of statements
+        if self.match(r"\("):
+            statements = []
+            while not self.match(r"\)"):
+                statements.append(self.statement())
+            output = self.output()
+            self.expect(r";", "';'")
+            return {"kind": "union", "statements": statements, "output": output}
+
+        # Query statement
+        m = self.match(r"(nwr|node|way|relation|rel)\b")
+        if m:
+            statement = {"kind": "query", "types": elementtypes[m.group(1)], "input": None, "tags": [], "spatial": []}
+            m = self.match(r"\.(\w+)")
+            if m:
+                statement["input"] = m.group(1)
+            while True:
+                if self.match(r"\["):
+                    statement["tags"].append(self.tag_filter())
+                elif self.match(r"\("):
+                    statement["spatial"].append(self.spatial_filter())
+                else:
+                    break
+            statement["output"] = self.output()
+            self.expect(r";", "';'")
+            return statement
+
+        # Output statement
+        m = self.match(r"(?:\.(\w+)\s+)?out\b")
+        if m:
+            modifiers = self.expect(r"[^;]*", "out modifiers").group(0).split()
+            self.expect(r";", "';'")
+            return {"kind": "out", "input": m.group(1) or "_", "modifiers": modifiers}
+
+        raise QueryError("line " + str(self.text.count("\n", 0, self.pos) + 1) + ": parse error: unsupported statement")
+
+    def tag_filter(self):
+        key = self.unquote(self.expect(r"\"(?:[^\"\\]|\\.)*\"|[^\s=!~\]]+", "key").group(0))
+        m = self.match(r"!=|=|!~|~")
+        if not m:
+            self.expect(r"\]", "']'")
+            return (key, "exists", None)
+        value = self.unquote(self.expect(r"\"(?:[^\"\\]|\\.)*\"|[^\]]+?(?=\s*\])", "value").group(0))
+        self.expect(r"\]", "']'")
+        return (key, m.group(0), value)
+
+    def spatial_filter(self):
+        m = self.match(r"poly\s*:\s*\"([^\"]*)\"")
+        if m:
+            values = [float(value) for value in m.group(1).split()]
+            self.expect(r"\)", "')'")
+            return ("poly", shapely.Polygon(list(zip(values[1::2], values[0::2]))))
+
+        m = self.match(r"around(?:\.(\w+))?\s*:\s*(" + number + r")")
+        if m:
+            self.expect(r"\)", "')'")
+            return ("around", m.group(1) or "_", float(m.group(2)))
+
+        m = self.expect(r"(" + number + r")\s*,\s*(" + number + r")\s*,\s*(" + number + r")\s*,\s*(" + number + r")", "poly:, around or bbox filter")
+        self.expect(r"\)", "')'")
+        return ("bbox", tuple(float(value) for value in m.groups()))
+
+
+class OverpassDatabase:
+    """
+    OpenStreetMap features loaded from GeoJSON extracts, indexed for the
+    supported Overpass QL filters.
+
+    Parameters:
+    filenames (list): The GeoJSON files exported from OpenStreetMap with
+                      Overpass Turbo. A feature found in several files is only
+                      loaded once.
+    """
+
+    def __init__(self, filenames):
+        self.types = []
+        self.ids = []
+        self.tags = []
+        geometries = []
+        seen = set()
+
+        for filename in filenames:
+            data = json.loads(open(filename, encoding='utf8').read())
+
+            for element in data["features"]:
+                if element["id"] in seen:
+                    continue
+                seen.add(element["id"])
+                elementtype, id = element["id"].split("/")
+                self.types.append(elementtype)
+                self.ids.append(int(id))
+                self.tags.append({key: value for key, value in element["properties"].items() if not key.startswith("@")})
+                geometries.append(shapely.geometry.shape(element["geometry"]))
+
+        self.types = np.array(self.types)
+        self.geometries = np.array(geometries, dtype=object)
+        self.projected = project(self.geometries)
+        self.tree = shapely.STRtree(self.projected)
+        self.around = around_geometries(self.projected)
+        self.aroundtree = shapely.STRtree(self.around)
+
+        # Index the features by tag so that [k=v] filters do not scan every feature
+        self.tagindex = {}
+        for i, tags in enumerate(self.tags):
+            for key, value in tags.items():
+                self.tagindex.setdefault((key, value), []).append(i)
+        self.tagindex = {key: np.array(indices) for key, indices in self.tagindex.items()}
+
+    def spatial(self, condition, sets):
+        """
+        Finds the features that satisfy a spatial filter.
+
+        Parameters:
+        condition (tuple): A filter from QueryParser.spatial_filter.
+        sets (dict): The named sets of the query.
+
+        Returns:
+        numpy.ndarray: The sorted indices of the features.
+        """
+
+        if condition[0] == "poly":
+            return np.unique(self.tree.query(project(condition[1]), predicate="intersects"))
+
+        if condition[0] == "bbox":
+            south, west, north, east = condition[1]
+            box = shapely.segmentize(shapely.box(west, south, east, north), 0.001)
+            return np.unique(self.tree.query(project(box), predicate="intersects"))
+
+        members = sets.get(condition[1], np.array([], dtype=int))
+        if len(members) == 0:
+            return members
+        featureidx = self.aroundtree.query(self.around[members], predicate="dwithin", distance=condition[2])[1]
+        return np.unique(featureidx)
+
+    def tag_matches(self, i, conditions):
+        tags = self.tags[i]
+        for key, operator, value in conditions:
+            if operator == "exists":
+                if key not in tags:
+                    return False
+            elif operator == "=":
+                if tags.get(key) != value:
+                    return False
+            elif operator == "!=":
+                if tags.get(key) == value:
+                    return False
+            elif operator == "~":
+                if key not in tags or re.search(value, tags[key]) is None:
+                    return False
+            elif operator == "!~":
+                if key in tags and re.search(value, tags[key]) is not None:
+                    return False
+        return True
+
+    def query(self, statement, settings, sets):
+        """
+        Evaluates a query statement.
+
+        Returns:
+        numpy.ndarray: The sorted indices of the matching features.
+        """
+
+        candidates = None
+        if statement["input"] is not None:
+            candidates = sets.get(statement["input"], np.array([], dtype=int))
+
+        # Apply the spatial filters and the global bounding box first, since they use the index
+        conditions = list(statement["spatial"])
+        if "bbox" in settings:
+            conditions.append(("bbox", tuple(float(value) for value in settings["bbox"].split(","))))
+        for condition in conditions:
+            indices = self.spatial(condition, sets)
+            candidates = indices if candidates is None else np.intersect1d(candidates, indices, assume_unique=True)
+
+        # Start from the features with the first exact tag if no filter narrowed them down
+        if candidates is None:
+            exact = [condition for condition in statement["tags"] if condition[1] == "="]
+            if exact:
+                candidates = self.tagindex.get((exact[0][0], exact[0][2]), np.array([], dtype=int))
+            else:
+                candidates = np.arange(len(self.tags))
+
+        if len(statement["types"]) < 3:
+            candidates = candidates[np.isin(self.types[candidates], statement["types"])]
+
+        if statement["tags"]:
+            candidates = np.array([i for i in candidates if self.tag_matches(i, statement["tags"])], dtype=int)
+
+        return candidates
+
+    def element(self, i, geometry):
+        """
+        Converts a feature into an element of an Overpass API JSON response.
+
+        Parameters:
+        i (int): The index of the feature.
+        geometry (bool): Include the coordinates of ways and relations ("out geom").
+
+        Returns:
+        dict: The JSON element.
+        """
+
+        element = {"type": self.types[i], "id": self.ids[i]}
+        shape = self.geometries[i]
+
+        if self.types[i] == "node":
+            point = shapely.centroid(shape)
+            element["lat"] = point.y
+            element["lon"] = point.x
+        elif self.types[i] == "way":
+            element["nodes"] = []
+            if geometry:
+                line = shape.exterior if shape.geom_type == "Polygon" else shape
+                element["geometry"] = [{"lat": y, "lon": x} for x, y in shapely.get_coordinates(line)]
+        else:
+            element["members"] = []
+            if geometry:
+                for part in shapely.get_parts(shape):
+                    rings = [("outer", part.exterior)] + [("inner", ring) for ring in part.interiors] if part.geom_type == "Polygon" else [("", part)]
+                    for role, line in rings:
+                        element["members"].append({"type": "way", "ref": 0, "role": role,
+                                                   "geometry": [{"lat": y, "lon": x} for x, y in shapely.get_coordinates(line)]})
+
+        element["tags"] = self.tags[i]
+        return element
+
+    def execute(self, text):
+        """
+        Runs a query.
+
+        Parameters:
+        text (str): The query in Overpass QL.
+
+        Returns:
+        dict: The Overpass API JSON response.
+
+        Raises:
+        QueryError: If the query uses Overpass QL that is not supported.
+        """
+
+        settings, statements = QueryParser(text).parse()
+        if settings.get("out", "json") != "json":
+            raise QueryError("only [out:json] is supported")
+
+        sets = {}
+        elements = []
+
+        def run(statement):
+            if statement["kind"] == "union":
+                results = [run(substatement) for substatement in statement["statements"]]
+                result = np.unique(np.concatenate(results)).astype(int) if results else np.array([], dtype=int)
+            elif statement["kind"] == "query":
+                result = self.query(statement, settings, sets)
+            else:
+                members = sets.get(statement["input"], np.array([], dtype=int))
+                if "count" in statement["modifiers"]:
+                    counts = {elementtype: int(np.sum(self.types[members] == elementtype)) for elementtype in ("node", "way", "relation")}
+                    elements.append({"type": "count", "id": 0, "tags": {
+                        "nodes": str(counts["node"]), "ways": str(counts["way"]),
+                        "relations": str(counts["relation"]), "total": str(len(members))}})
+                else:
+                    elements.extend(self.element(i, "geom" in statement["modifiers"]) for i in members)
+                return members
+
+            sets[statement["output"]] = result
+            return result
+
+        for statement in statements:
+            run(statement)
+
+        return {"version": 0.6, "generator": "OverpassServer.py", "osm3s": {}, "elements": elements}
+
+
+class OverpassRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers the interpreter and status requests of the Overpass API.
+    """
+
+    def send(self, code, body, contenttype):
+        self.send_response(code)
+        self.send_header("Content-Type", contenttype)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def interpret(self, query):
+        try:
+            response = self.server.database.execute(query)
+        except QueryError as e:
+            message = "<p><strong style=\"color:#FF0000\">Error</strong>: " + str(e) + " </p>"
+            self.send(400, message.encode("utf-8"), "text/html; charset=utf-8")
+            return
+
+        with self.server.lock:
+            self.server.queries += 1
+        self.send(200, json.dumps(response).encode("utf-8"), "application/json")
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf-8")
+        if body.startswith("data="):
+            body = parse_qs(body)["data"][0]
+        self.interpret(body)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path.endswith("/status"):
+            status = ("Connected as: 0\nCurrent time: 1970-01-01T00:00:00Z\nRate limit: " + str(self.server.ratelimit)
+                      + "\n" + str(max(self.server.ratelimit, 1)) + " slots available now.\n"
+                      + "Currently running queries (pid, space limit, time limit, start time):\n")
+            self.send(200, status.encode("utf-8"), "text/plain")
+        else:
+            self.interpret(parse_qs(url.query).get("data", [""])[0])
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(filenames, host="127.0.0.1", port=0, ratelimit=0):
+    """
+    Loads the GeoJSON extracts and starts the server in a background thread.
+
+    Parameters:
+    filenames (list): The GeoJSON files exported from OpenStreetMap.
+    host (str): The address the server listens on.
+    port (int): The port the server listens on, or 0 for any free port.
+    ratelimit (int): The number of query slots reported on the status page, or
+                     0 for unlimited.
+
+    Returns:
+    ThreadingHTTPServer: The running server. Its url attribute holds the URL of
+                         the interpreter, to be passed to CountingOverpass.
+    """
+
+    server = ThreadingHTTPServer((host, port), OverpassRequestHandler)
+    server.database = OverpassDatabase(filenames)
+    server.ratelimit = ratelimit
+    server.queries = 0
+    server.lock = threading.Lock()
+    server.url = "http://" + host + ":" + str(server.server_address[1]) + "/api/interpreter"
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    return server
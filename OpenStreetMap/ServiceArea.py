@@ -0,0 +1,263 @@
+# -*- coding: utf-8 -*-
+"""
+ServiceArea.py
+
+Description: This is a Python module that computes the area within walking
+distance of an amenity category once, instead of buffering the same amenities
+again for every neighborhood query, and caches it in a GeoParquet file.
+
+The service area of a category and walking distance is the union of the
+buffers of all its amenities, with polygons replaced by their rings as the
+Overpass around filter measures them (straight line distance), or the points
+from which the walk along the ORN road network to an amenity, plus the straight
+line walk between the point and the road, is within the walking distance
+(network distance). The area is dissolved into a single geometry, so the indicator step
+is one vectorized intersects test of the residential buildings against it.
+
+A cached area is stored with a key computed from the amenity geometries and, for
+the network distance, the road links, so it is recomputed when the amenity
+files, their filters or the roads change.
+
+"""
+
+# Import modules
+import os
+import hashlib
+import numpy as np
+import pandas as pd
+import shapely
+import geopandas as gpd
+
+from Indicators import amenities
+from NetworkDistance import amenity_distances
+from Geometry import metriccrs, project
+from SpatialJoin import load_features, around_geometries
+
+
+def euclidean_service_area(amenitygeometries, distance):
+    """
+    Computes the area within a straight line distance of any amenity.
+
+    Parameters:
+    amenitygeometries (numpy.ndarray): Projected amenity geometries from
+                                       around_geometries, so that the area is
+                                       a band around the outline of each
+                                       polygon, not the polygon itself.
+    distance (float): The walking distance in metres.
+
+    Returns:
+    shapely.Geometry: The dissolved buffers of the amenities.
+    """
+
+    return shapely.union_all(shapely.buffer(amenitygeometries, distance))
+
+
+def network_service_area(graph, amenitygeometries, distance, spacing=5):
+    """
+    Computes the area within a walking distance of any amenity along the road
+    network.
+
+    As in network_near_amenity, a point of the area walks in a straight line to
+    the nearest point of the road network, and from there along the roads to an
+    amenity, and the two walks together are within the walking distance. The
+    road links are divided into points at most spacing metres apart, and the
+    area is the union, over every point that can reach an amenity, of the part
+    of its Voronoi cell within the walking distance left at the point.
+
+    A building is tested at its access point from access_points, the point of
+    the building nearest to the road network, since a building that spans
+    several cells would otherwise be in the area when any of its parts is. The
+    walk from a point of the area is then measured from a road point at most
+    spacing / 2 metres from the one network_near_amenity snaps the building to,
+    so the two agree on the buildings whose walk differs from the walking
+    distance by more than about spacing metres.
+
+    Parameters:
+    graph (RoadGraph): The road network, with its link geometries.
+    amenitygeometries (numpy.ndarray): Projected amenity geometries.
+    distance (float): The walking distance in metres.
+    spacing (float): The largest distance in metres between the road points.
+
+    Returns:
+    shapely.Geometry: The dissolved area, empty if no road can be reached.
+    """
+
+    junctiondistances, amenitysnaps = amenity_distances(graph, amenitygeometries, distance)
+    lengths = graph.lengths
+
+    # The links that can be walked on, from their junctions or from an amenity on them
+    reached = (junctiondistances[graph.source] < distance) | (junctiondistances[graph.target] < distance)
+    reached[amenitysnaps["link"][amenitysnaps["access"] < distance]] = True
+    if not reached.any():
+        return shapely.Polygon()
+
+    # The Voronoi cells of the points of the links reached depend on the links
+    # around them up to twice the walking distance
+    tree = shapely.STRtree(graph.links)
+    xmin, ymin, xmax, ymax = shapely.total_bounds(graph.links[reached])
+    envelope = shapely.box(xmin - 2 * distance, ymin - 2 * distance, xmax + 2 * distance, ymax + 2 * distance)
+    links = tree.query(envelope)
+
+    # Divide the links into points and locate them along their links in metres
+    coords, index = shapely.get_coordinates(shapely.segmentize(graph.links[links], spacing), return_index=True)
+    pointlinks = links[index]
+    points = shapely.points(coords)
+    geometrylengths = shapely.length(graph.links[pointlinks])
+    scale = np.divide(lengths[pointlinks], geometrylengths, out=np.zeros(len(points)), where=geometrylengths > 0)
+    offsets = shapely.line_locate_point(graph.links[pointlinks], points) * scale
+
+    # Walk from each point to either junction of its link
+    walk = np.minimum(junctiondistances[graph.source[pointlinks]] + offsets,
+                      junctiondistances[graph.target[pointlinks]] + lengths[pointlinks] - offsets)
+
+    # Walk along the link directly to the amenities on it
+    order = np.argsort(pointlinks, kind="stable")
+    sortedlinks = pointlinks[order]
+    for link, offset, amenityaccess in amenitysnaps[["link", "offset", "access"]]:
+        onlink = order[np.searchsorted(sortedlinks, link, side="left"):np.searchsorted(sortedlinks, link, side="right")]
+        walk[onlink] = np.minimum(walk[onlink], amenityaccess + np.abs(offsets[onlink] - offset))
+
+    # A junction is a point of all its links, with the shortest of their walks
+    coords, unique = np.unique(coords, axis=0, return_inverse=True)
+    left = np.full(len(coords), -np.inf)
+    np.maximum.at(left, unique.ravel(), distance - walk)
+
+    cells = shapely.get_parts(shapely.voronoi_polygons(shapely.multipoints(coords), extend_to=envelope, ordered=True))
+
+    # The cells within the walking distance left at their point form a coverage,
+    # which is dissolved quickly, and only the others are cut by the distance
+    cellcoords, cellindex = shapely.get_coordinates(cells, return_index=True)
+    radius = np.zeros(len(cells))
+    np.maximum.at(radius, cellindex, np.hypot(*(cellcoords - coords[cellindex]).T))
+    full = radius <= left
+    cut = (left > 0) & ~full
+    parts = shapely.intersection(cells[cut], shapely.buffer(shapely.points(coords[cut]), left[cut]))
+
+    return shapely.union_all(np.append(parts, shapely.coverage_union_all(cells[full])))
+
+
+def area_key(amenitygeometries, graph=None):
+    """
+    Computes a key that changes with the amenities or, for the network distance,
+    the road network.
+
+    Parameters:
+    amenitygeometries (numpy.ndarray): Projected amenity geometries.
+    graph (RoadGraph): Optional road network.
+
+    Returns:
+    str: The hexadecimal SHA-256 hash of the amenities and road links.
+    """
+
+    if graph is not None:
+        return graph.key(amenitygeometries)
+
+    key = hashlib.sha256()
+    for wkb in shapely.to_wkb(amenitygeometries):
+        key.update(wkb)
+
+    return key.hexdigest()
+
+
+def service_areas(filename, amenitynames, walkdistances, graph=None):
+    """
+    Reads the service areas of amenity categories from a GeoParquet file,
+    computing and adding the ones it does not hold yet or that were computed
+    from other amenities or roads.
+
+    Parameters:
+    filename (str): The GeoParquet file the service areas are cached in.
+    amenitynames (list): The amenity categories, as named in Indicators.py.
+    walkdistances (list): The walking distances in metres, e.g. ["400", "800"].
+    graph (RoadGraph): Optional road network. If given, the service areas use
+                       the network distance, otherwise the straight line distance.
+
+    Returns:
+    dict: The projected service area of every (amenity, walkdistance) pair.
+    """
+
+    mode = "euclidean" if graph is None else "network"
+
+    if os.path.exists(filename):
+        cache = gpd.read_parquet(filename).to_crs(metriccrs)
+    else:
+        cache = gpd.GeoDataFrame({"amenity": [], "walkdistance": [], "mode": [], "key": []}, geometry=[], crs=metriccrs)
+
+    # Areas cached before the key was stored are never reused
+    if "key" not in cache.columns:
+        cache["key"] = ""
+
+    areas = {}
+    added = []
+    for amenity in amenitynames:
+
+        # Load and project the amenities, whose key tells if the cached areas still hold
+        amenityids, amenitygeometries = load_features(amenities[amenity]["files"], amenities[amenity]["filters"])
+        amenitygeometries = project(amenitygeometries)
+        if graph is None:
+            amenitygeometries = around_geometries(amenitygeometries)
+        key = area_key(amenitygeometries, graph)
+
+        cached = cache[(cache["amenity"] == amenity) & (cache["mode"] == mode) & (cache["key"] == key)]
+        for row in cached.itertuples():
+            areas[(amenity, row.walkdistance)] = row.geometry
+
+        missing = [walkdistance for walkdistance in walkdistances if (amenity, walkdistance) not in areas]
+        if missing:
+            # Drop the areas of the category computed from other amenities or roads
+            cache = cache[~((cache["amenity"] == amenity) & (cache["mode"] == mode) & (cache["key"] != key))]
+
+        for walkdistance in missing:
+            if graph is None:
+                area = euclidean_service_area(amenitygeometries, float(walkdistance))
+            else:
+                area = network_service_area(graph, amenitygeometries, float(walkdistance))
+            areas[(amenity, walkdistance)] = area
+            added.append({"amenity": amenity, "walkdistance": walkdistance, "mode": mode, "key": key, "geometry": area})
+
+    # Save the new service areas with the ones computed before
+    if added:
+        cache = pd.concat([cache, gpd.GeoDataFrame(added, geometry="geometry", crs=metriccrs)], ignore_index=True)
+        cache.to_parquet(filename)
+
+    return areas
+
+
+def access_points(graph, buildings, buildingsnaps):
+    """
+    Finds the point of each building nearest to the road network, from which
+    network_near_amenity walks to the road.
+
+    Parameters:
+    graph (RoadGraph): The road network, with its link geometries.
+    buildings (numpy.ndarray): Projected building geometries.
+    buildingsnaps (numpy.ndarray): The snaps of the buildings from snap_to_links.
+
+    Returns:
+    numpy.ndarray: The Shapely points of the buildings.
+    """
+
+    links = buildingsnaps["link"]
+    lengths = graph.lengths[links]
+    fractions = np.divide(buildingsnaps["offset"], lengths, out=np.zeros(len(links)), where=lengths > 0)
+    roadpoints = shapely.line_interpolate_point(graph.links[links], fractions, normalized=True)
+
+    return shapely.get_point(shapely.shortest_line(buildings, roadpoints), 0)
+
+
+def service_area_near(buildings, area):
+    """
+    Flags the buildings inside a service area.
+
+    Parameters:
+    buildings (numpy.ndarray): Projected building geometries from around_geometries,
+                               or their access points from access_points for a
+                               network service area.
+    area (shapely.Geometry): The projected service area.
+
+    Returns:
+    numpy.ndarray: A boolean array with one entry per building.
+    """
+
+    shapely.prepare(area)
+    return shapely.intersects(buildings, area)
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+"""
+SimplificationReport.py
+
+Description: This is a Python program that reports the effect of simplifying the
+neighborhood polygons and rounding their coordinates before they are sent to the
+Overpass API poly: filter. For each neighborhood it prints the vertex count and
+query length before and after, and, if comparecounts is enabled, the building
+and walking distance counts of both versions of the query, so that the count
+drift introduced by a tolerance can be checked before using it in Overpass.py.
+
+"""
+
+# Import modules
+import shapely
+
+from Indicators import amenities, get_neighbourhoods, neighbourhood_name
+from OverpassCache import OverpassCache
+from OverpassScheduler import OverpassScheduler
+from OverpassQL import CountingOverpass, neighbourhood_filters, walking_distance_query
+from Geometry import simplify
+
+# Declare OpenStreetMap Overpass API
+api = OverpassScheduler(CountingOverpass(cache=OverpassCache()))
+
+# Initialize variables
+tolerance = 5
+precision = 6
+amenity = "Park"
+walkdistance = "400"
+comparecounts = False
+
+# Save query results as a Pandas DataFrame object
+df = get_neighbourhoods()
+
+# Initialize totals
+totalvertices = 0
+totalsimplifiedvertices = 0
+totallength = 0
+totalsimplifiedlength = 0
+totaldrift = 0
+
+# Iterate for each neighborhood in the query result
+for n in range(len(df)):
+    neighbourhood = neighbourhood_name(df.iloc[n]["area"])
+
+    # Convert the WKT polygon coordinates to the original and simplified polygons
+    poly = shapely.from_wkt(df.iloc[n]["coordinates"])
+    simplifiedpoly = simplify(poly, tolerance) if tolerance > 0 else poly
+
+    # Build the query of the neighborhood from all the polygons that comprise it
+    polylists = neighbourhood_filters(poly)
+    simplifiedpolylists = neighbourhood_filters(simplifiedpoly, precision)
+
+    vertices = sum(len(polylist.split()) // 2 for polylist in polylists)
+    simplifiedvertices = sum(len(polylist.split()) // 2 for polylist in simplifiedpolylists)
+    query = walking_distance_query(polylists, amenities[amenity]["filters"], walkdistance)
+    simplifiedquery = walking_distance_query(simplifiedpolylists, amenities[amenity]["filters"], walkdistance)
+
+    length = len(query)
+    simplifiedlength = len(simplifiedquery)
+
+    totalvertices += vertices
+    totalsimplifiedvertices += simplifiedvertices
+    totallength += length
+    totalsimplifiedlength += simplifiedlength
+
+    print(neighbourhood + ": " + str(vertices) + " -> " + str(simplifiedvertices) + " vertices, "
+          + str(length) + " -> " + str(simplifiedlength) + " query characters")
+
+    # Compare the counts of the original and simplified queries
+    if comparecounts:
+        counts = api.query(query).counts
+        simplifiedcounts = api.query(simplifiedquery).counts
+
+        drift = abs(simplifiedcounts[0] - counts[0]) + abs(simplifiedcounts[1] - counts[1])
+        totaldrift += drift
+
+        print("    buildings " + str(counts[0]) + " -> " + str(simplifiedcounts[0])
+              + ", walking distance " + str(counts[1]) + " -> " + str(simplifiedcounts[1]))
+
+# Print the totals
+print("Vertices: " + str(totalvertices) + " -> " + str(totalsimplifiedvertices)
+      + " (" + str(round(100 * (1 - totalsimplifiedvertices / max(totalvertices, 1)), 1)) + "% fewer)")
+print("Query characters: " + str(totallength) + " -> " + str(totalsimplifiedlength)
+      + " (" + str(round(100 * (1 - totalsimplifiedlength / max(totallength, 1)), 1)) + "% fewer)")
+if comparecounts:
+    print("Total count drift: " + str(totaldrift))
+    print(api.summary())
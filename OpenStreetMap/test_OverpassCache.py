@@ -0,0 +1,137 @@
+# -*- coding: utf-8 -*-
+"""
+test_OverpassCache.py
+
+Description: This is a Python module that tests the expiry and eviction of the
+Overpass API response cache of OverpassCache.py, that responses which do not
+parse never stay in it, and that CountingOverpass answers repeated queries to
+the local server of OverpassServer.py from the cache. Run it with
+python -m unittest test_OverpassCache from the OpenStreetMap directory.
+
+"""
+
+# Import modules
+import os
+import json
+import time
+import tempfile
+import unittest
+
+from unittest import mock
+from OverpassCache import OverpassCache
+from OverpassQL import CountingOverpass
+from OverpassScheduler import OverpassScheduler
+from OverpassServer import start_server
+
+# A response with a single count element, as returned by the Overpass API
+RESPONSE = (b'{"version": 0.6, "generator": "Overpass API", "osm3s": {}, "elements": '
+            b'[{"type": "count", "id": 0, "tags": {"total": "3"}}]}')
+
+
+class OverpassCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.start = time.time()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def at(self, seconds):
+        # Run the cache as if seconds had passed since the test started
+        return mock.patch("OverpassCache.time.time", return_value=self.start + seconds)
+
+    def test_read_entry_expires(self):
+        cache = OverpassCache(self.directory.name, ttl=100)
+        cache.put("query", b"response")
+        path = cache.path(cache.key("query"))
+        os.utime(path, (self.start - 90, self.start - 90))
+
+        # Reading the entry regularly does not extend its time to live
+        for seconds in [0, 5]:
+            with self.at(seconds):
+                self.assertEqual(cache.get("query"), b"response")
+        self.assertAlmostEqual(os.path.getmtime(path), self.start - 90, delta=1)
+        with self.at(20):
+            self.assertIsNone(cache.get("query"))
+        self.assertEqual(cache.size, 0)
+
+    def test_evicts_least_recently_used(self):
+        cache = OverpassCache(self.directory.name, maxsize=2 * len(b"response"))
+        cache.put("first", b"response")
+        cache.put("second", b"response")
+        os.utime(cache.path(cache.key("first")), (self.start - 20, self.start - 20))
+        os.utime(cache.path(cache.key("second")), (self.start - 10, self.start - 10))
+
+        # Reading the first entry makes the second one the least recently used
+        with self.at(0):
+            self.assertEqual(cache.get("first"), b"response")
+        cache.put("third", b"response")
+
+        self.assertEqual(cache.get("first"), b"response")
+        self.assertIsNone(cache.get("second"))
+        self.assertEqual(cache.get("third"), b"response")
+
+    def test_truncated_response_retried_and_not_cached(self):
+        cache = OverpassCache(self.directory.name)
+        api = CountingOverpass(cache=cache)
+        scheduler = OverpassScheduler(api, basedelay=0)
+
+        # The first response is cut off, so it does not parse and is retried
+        with mock.patch.object(api, "fetch", side_effect=[RESPONSE[:40], RESPONSE]) as fetch:
+            result = scheduler.query("query")
+
+        self.assertEqual(result.counts, [3])
+        self.assertEqual(fetch.call_count, 2)
+        self.assertEqual(scheduler.retries, 1)
+        self.assertEqual(cache.get("query"), RESPONSE)
+
+    def test_corrupt_entry_fetched_again(self):
+        cache = OverpassCache(self.directory.name)
+        cache.put("query", RESPONSE[:40])
+        api = CountingOverpass(cache=cache)
+
+        with mock.patch.object(api, "fetch", return_value=RESPONSE) as fetch:
+            result = api.query("query")
+
+        self.assertFalse(result.cached)
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(cache.get("query"), RESPONSE)
+
+    def test_repeated_query_served_from_cache(self):
+        # Serve a single school from a local stand-in for the Overpass API
+        filename = os.path.join(self.directory.name, "schools.geojson")
+        with open(filename, "w", encoding="utf8") as f:
+            json.dump({"type": "FeatureCollection", "features": [{
+                "type": "Feature", "id": "node/1", "properties": {"amenity": "school"},
+                "geometry": {"type": "Point", "coordinates": [-79.39, 43.66]}}]}, f)
+        server = start_server([filename])
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        cache = OverpassCache(os.path.join(self.directory.name, "cache"), ttl=100)
+        api = CountingOverpass(url=server.url, cache=cache)
+        query = "[out:json];node[amenity=school];out count;"
+
+        # The first query reaches the server and its response is stored
+        result = api.query(query)
+        self.assertEqual(result.counts, [1])
+        self.assertFalse(result.cached)
+        self.assertEqual(server.queries, 1)
+
+        # The same query is answered from disk without a request
+        result = api.query(query)
+        self.assertEqual(result.counts, [1])
+        self.assertTrue(result.cached)
+        self.assertEqual(server.queries, 1)
+
+        # Once the response has expired the query is sent again
+        with self.at(200):
+            result = api.query(query)
+        self.assertEqual(result.counts, [1])
+        self.assertFalse(result.cached)
+        self.assertEqual(server.queries, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+test_SpatialJoin.py
+
+Description: This is a Python module that tests that the local walking distance
+of SpatialJoin.py and the around filter of the local server of OverpassServer.py
+count a building near a park the way the Overpass API does: by its distance to
+the outline of the park, so a building deep inside a large park is not within
+walking distance of it. Run it with python -m unittest test_SpatialJoin from the
+OpenStreetMap directory.
+
+"""
+
+# Import modules
+import os
+import json
+import tempfile
+import unittest
+import numpy as np
+import shapely
+
+from Geometry import project, unproject
+from OverpassQL import CountingOverpass
+from OverpassServer import start_server
+from SpatialJoin import near_amenity
+
+# A 500 m square park in Toronto, in metres from its south west corner
+ORIGIN = project(np.array([shapely.Point(-79.39, 43.66)]))[0]
+PARK = shapely.box(0, 0, 500, 500)
+
+# 10 m square buildings: in the middle of the park, 20 m inside its west edge,
+# 50 m east of it and 200 m east of it
+BUILDINGS = [shapely.box(245, 245, 255, 255), shapely.box(20, 245, 30, 255),
+             shapely.box(550, 245, 560, 255), shapely.box(700, 245, 710, 255)]
+NEAR = [False, True, True, False]
+
+
+def place(geometries):
+    # Move geometries given in metres from the park corner to Toronto
+    return shapely.transform(np.array(geometries, dtype=object), lambda coords: coords + shapely.get_coordinates(ORIGIN))
+
+
+class SpatialJoinTest(unittest.TestCase):
+
+    def test_near_amenity_measures_to_outline(self):
+        near = near_amenity(place(BUILDINGS), place([PARK]), 100)
+        self.assertEqual(near.tolist(), NEAR)
+
+    def test_local_server_around_measures_to_outline(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+
+        # Export the park and buildings as Overpass Turbo does
+        features = [{"type": "Feature", "id": "way/1", "properties": {"leisure": "park"},
+                     "geometry": shapely.geometry.mapping(unproject(place([PARK]))[0])}]
+        for i, building in enumerate(unproject(place(BUILDINGS))):
+            features.append({"type": "Feature", "id": "way/" + str(i + 2), "properties": {"building": "house"},
+                             "geometry": shapely.geometry.mapping(building)})
+        filename = os.path.join(directory.name, "park.geojson")
+        with open(filename, "w", encoding="utf8") as f:
+            json.dump({"type": "FeatureCollection", "features": features}, f)
+
+        server = start_server([filename])
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        api = CountingOverpass(url=server.url)
+        result = api.query("[out:json];way[leisure=park]->.parks;way[building=house](around.parks:100);out count;")
+        self.assertEqual(result.counts, [sum(NEAR)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,8 +4,10 @@ Generate TTL file with ORN Road Data mapped onto the Transportation ontology.
 
 import geopandas as gpd
 import pandas as pd
-from rdflib import Graph, Namespace, Literal, RDFS, XSD, RDF
+import shapely
+from rdflib import Namespace, Literal, RDFS, XSD, RDF
 from datetime import datetime
+from TripleSink import TripleSink
 
 # Define namespaces
 BASE_URI = "https://standards.iso.org/iso-iec/5087/-3/ed-1/en/ontology/"
@@ -58,6 +60,14 @@ toronto_bounds = {
     "lon_max": -79.1152,
 }
 
+# Find the road links whose lower-left bounding box corner is within Toronto, with
+# one vectorized mask on the bounds of all geometries
+road_bounds = road_network_gdf.bounds
+road_in_toronto = (
+    road_bounds["miny"].between(toronto_bounds["lat_min"], toronto_bounds["lat_max"]) &
+    road_bounds["minx"].between(toronto_bounds["lon_min"], toronto_bounds["lon_max"])
+)
+
 # Load CSV files with proper column renaming
 csv_files = {
     "speed_limits": "ORN_SPEED_LIMIT.csv",
@@ -90,6 +100,26 @@ for name, path in csv_files.items():
 
     data_frames[name] = df
 
+# Keep the junctions within Toronto
+junctions = data_frames["junctions"]
+data_frames["junctions"] = junctions[
+    junctions["LATITUDE_DECIMAL_DEGREES_junctions"].between(toronto_bounds["lat_min"], toronto_bounds["lat_max"]) &
+    junctions["LONGITUDE_DECIMAL_DEGREES_junctions"].between(toronto_bounds["lon_min"], toronto_bounds["lon_max"])
+]
+
+# Number the roads over the street names of all the road links, before they are
+# filtered. Each street takes one id, and a second one when it has a link within
+# Toronto, so the road URIs are the same as when the bounds were checked per link.
+street_names = road_network_gdf[["OGF_ID"]].assign(IN_TORONTO=road_in_toronto).merge(
+    data_frames["road_names"][["ORN_ROAD_NET_ELEMENT_ID", "FULL_STREET_NAME_road_names"]],
+    left_on="OGF_ID", right_on="ORN_ROAD_NET_ELEMENT_ID", how="left"
+)
+street_in_toronto = street_names.groupby("FULL_STREET_NAME_road_names")["IN_TORONTO"].any()
+road_ids = (1 + (1 + street_in_toronto.astype(int)).cumsum().shift(fill_value=0)).to_dict()
+
+# Keep the road links within Toronto, before the attribute tables are merged onto them
+road_network_gdf = road_network_gdf[road_in_toronto]
+
 # Merge all CSVs with the shapefile data using LEFT JOIN
 for name, df in data_frames.items():
     if "ORN_ROAD_NET_ELEMENT_ID" in df.columns:
@@ -100,25 +130,11 @@ for name, df in data_frames.items():
 # Final Check for Duplicate Columns
 road_network_gdf = road_network_gdf.loc[:, ~road_network_gdf.columns.duplicated()]  # Remove duplicate columns
 
-# Create RDF graph
-g = Graph()
-g.bind("rdfs", RDFS)
-g.bind("geo", GEO)
-g.bind("transnet", TRANSPORT)
-g.bind("loc", GEO_LOC)
-g.bind("partwhole", PARTWHOLE)
-g.bind("cityunits", CITYUNITS)
-g.bind("cdt", CDT)
-g.bind("transinfras", INFRAS)
-g.bind("infras", INFRASTRUCTURE)
-g.bind ("rdf", RDF)
-g.bind("i72", I72)
-g.bind("genprop", GEN)
-g.bind("org_city", ORG)
-g.bind("code", CODE)
-g.bind("city", CITY)
-g.bind("contact", CONTACT)
-g.bind("road", ROAD)
+# Write the triples to the Turtle file as they are generated, instead of holding
+# them in an rdflib Graph. The file is written as N-Triples, which is valid
+# Turtle. Only the schema triples are deduplicated in memory.
+output_file = "toronto_roads.ttl"
+g = TripleSink(output_file)
 
 # ***
 
@@ -129,8 +145,26 @@ direction_enum_uris = {
 }
 
 for label, enum_uri in direction_enum_uris.items():
-    g.add((enum_uri, RDF.type, TRANSPORT.LinkDirection))
-    g.add((enum_uri, RDFS.label, Literal(label)))
+    g.add_schema((enum_uri, RDF.type, TRANSPORT.LinkDirection))
+    g.add_schema((enum_uri, RDFS.label, Literal(label)))
+
+# Schema (TBox) triples of the classes used by the junctions and road links.
+# They are written once here, so the loops below only write instance triples.
+schema_triples = [
+    (TRANSPORT.Junction, RDFS.subClassOf, TRANSPORT.TransportNode),
+    (CDT.Junction, RDFS.subClassOf, TRANSPORT.Junction),
+    (GEO_LOC.Location, RDFS.subClassOf, GEO.Geometry),
+    (CDT.RoadLink, RDFS.subClassOf, INFRAS.RoadLink),
+    (INFRAS.RoadLink, RDFS.subClassOf, TRANSPORT.TravelledWayLink),
+    (TRANSPORT.TravelledWayLink, RDFS.subClassOf, INFRASTRUCTURE.InfrastructureElement),
+    (CITYUNITS.Speed, RDFS.subClassOf, I72.Quantity),
+    (CITYUNITS.Length, RDFS.subClassOf, I72.Quantity),
+    (ORG.GovernmentOrganization, RDFS.subClassOf, ORG.Organization),
+    (CDT.Road, RDFS.subClassOf, INFRAS.Road),
+]
+
+for triple in schema_triples:
+    g.add_schema(triple)
 
 # Function to safely convert date strings to XSD.date format
 def format_date(value: str) -> str | None:
@@ -160,120 +194,132 @@ def format_date(value: str) -> str | None:
     return None
 
 # Adding Junctions to the RDF Graph
-for _, row in data_frames["junctions"].iterrows():
-    junction_id = row["JUNCTION_ID_junctions"]
-    latitude = row["LATITUDE_DECIMAL_DEGREES_junctions"]
-    longitude = row["LONGITUDE_DECIMAL_DEGREES_junctions"]
-    junction_type = row["JUNCTION_TYPE_junctions"]
-    junc_exit_num = row["EXIT_NUMBER_junctions"]
-    junc_uuid = row["NATIONAL_UUID_junctions"]
-    junc_effec_date = row["EFFECTIVE_DATETIME_junctions"]
-
-    # Ensure junctions are within Toronto bounds
-    if not (toronto_bounds["lat_min"] <= latitude <= toronto_bounds["lat_max"] and
-            toronto_bounds["lon_min"] <= longitude <= toronto_bounds["lon_max"]):
-        continue
+# The columns are read as NumPy arrays and the URI names and WKT points are built
+# column-wise, instead of creating a pandas Series for every row with iterrows()
+junctions = data_frames["junctions"]
+junction_ids = junctions["JUNCTION_ID_junctions"].astype(str)
+junction_columns = zip(
+    junctions["JUNCTION_ID_junctions"].to_numpy(),
+    junctions["JUNCTION_TYPE_junctions"].to_numpy(),
+    junctions["EXIT_NUMBER_junctions"].astype(str).to_numpy(),
+    junctions["NATIONAL_UUID_junctions"].to_numpy(),
+    junctions["EFFECTIVE_DATETIME_junctions"].to_numpy(),
+    ("junction_" + junction_ids).to_numpy(),
+    ("junction_loc_" + junction_ids).to_numpy(),
+    ("junction_type_" + junction_ids).to_numpy(),
+    ("junctionType_Code" + junction_ids).to_numpy(),
+    ("POINT (" + junctions["LONGITUDE_DECIMAL_DEGREES_junctions"].astype(str) + " "
+     + junctions["LATITUDE_DECIMAL_DEGREES_junctions"].astype(str) + ")").to_numpy(),
+)
+
+for (junction_id, junction_type, junc_exit_num, junc_uuid, junc_effec_date,
+     junction_name, location_name, junction_type_name, junction_code_name, wkt_point) in junction_columns:
 
     # Create URIs
-    junction_uri = CDT[f"junction_{junction_id}"]
-    location_uri = GEO_LOC[f"junction_loc_{junction_id}"]
-    junction_type_uri = CDT[f"junction_type_{junction_id}"]
-    junction_type_code = CODE[f"junctionType_Code{junction_id}"]
-
-    # Add triples for the junction
-    g.add((junction_uri, GEN.hasIdentifier, Literal(int(junction_id), datatype=XSD.integer)))
-    g.add((TRANSPORT.Junction, RDFS.subClassOf, TRANSPORT.TransportNode))
-    g.add((CDT.Junction, RDFS.subClassOf, TRANSPORT.Junction))
-    g.add((junction_uri, GEO_LOC.hasLocation, location_uri))
-    g.add((junction_uri, RDF.type, CDT.Junction))
-
-    g.add((junction_uri, CDT.hasJunctionType, junction_type_uri))
-    g.add((junction_type_uri, RDF.type, CDT.JunctionType))
-    g.add((junction_type_uri, CODE.hasCode, junction_type_code))
-    g.add((junction_type_code, RDF.type, CODE.Code))
-    g.add((junction_type_code, GEN.hasName, Literal(junction_type, datatype=XSD.string)))
-
-    g.add((junction_uri, CDT.exitNumber, Literal(str(junc_exit_num), datatype=XSD.string)))
-    g.add((junction_uri, CDT.nationUUID, Literal(junc_uuid, datatype=XSD.string)))
-    g.add((junction_uri, CDT.effectiveDate, Literal(format_date(junc_effec_date), datatype=XSD.date)))
-
-    # Add geospatial coordinates
-    wkt_point = f"POINT ({longitude} {latitude})"
-    g.add((location_uri, RDF.type, GEO_LOC.Location))
-    g.add((GEO_LOC.Location, RDFS.subClassOf, GEO.Geometry))
-    g.add((location_uri, GEO.asWKT, Literal(wkt_point, datatype=GEO.wktLiteral)))
+    junction_uri = CDT[junction_name]
+    location_uri = GEO_LOC[location_name]
+    junction_type_uri = CDT[junction_type_name]
+    junction_type_code = CODE[junction_code_name]
+
+    # Add triples for the junction and its geospatial coordinates in one batch
+    g.add_many([
+        (junction_uri, GEN.hasIdentifier, Literal(int(junction_id), datatype=XSD.integer)),
+        (junction_uri, GEO_LOC.hasLocation, location_uri),
+        (junction_uri, RDF.type, CDT.Junction),
+
+        (junction_uri, CDT.hasJunctionType, junction_type_uri),
+        (junction_type_uri, RDF.type, CDT.JunctionType),
+        (junction_type_uri, CODE.hasCode, junction_type_code),
+        (junction_type_code, RDF.type, CODE.Code),
+        (junction_type_code, GEN.hasName, Literal(junction_type, datatype=XSD.string)),
+
+        (junction_uri, CDT.exitNumber, Literal(junc_exit_num, datatype=XSD.string)),
+        (junction_uri, CDT.nationUUID, Literal(junc_uuid, datatype=XSD.string)),
+        (junction_uri, CDT.effectiveDate, Literal(format_date(junc_effec_date), datatype=XSD.date)),
+
+        (location_uri, RDF.type, GEO_LOC.Location),
+        (location_uri, GEO.asWKT, Literal(wkt_point, datatype=GEO.wktLiteral)),
+    ])
 
 
 # Adding Roads to the RDF Graph
-id = 1
-road_groups = road_network_gdf.groupby("FULL_STREET_NAME_road_names")
+# Build the URI names and the WKT of every road link column-wise, and keep only the
+# columns used below, so that each group can be walked with itertuples(). Columns
+# missing from the data are added empty.
+road_network_gdf["ROAD_LINK_NAME"] = "roadLink_" + road_network_gdf["OGF_ID"]
+road_network_gdf["LOCATION_NAME"] = "location_" + road_network_gdf["OGF_ID"]
+road_network_gdf["ROAD_USER_NAME"] = "roadLinkUser_" + road_network_gdf["OGF_ID"]
+road_network_gdf["WKT"] = shapely.to_wkt(road_network_gdf.geometry.to_numpy(), rounding_precision=-1)
+
+road_link_columns = [
+    "OGF_ID", "ROAD_LINK_NAME", "LOCATION_NAME", "ROAD_USER_NAME", "WKT",
+    "SPEED_LIMIT_speed_limits", "ROAD_CLASS_road_classes", "FULL_STREET_NAME_road_names",
+    "BLOCKED_PASSAGE_TYPE_blocked_passage", "JURISDICTION_jurisdiction", "NUMBER_OF_LANES_num_lanes",
+    "PAVEMENT_STATUS_road_surface", "SURFACE_TYPE_road_surface", "ROUTE_NAME_ENGLISH_route_name",
+    "ROUTE_NUMBER_route_number", "STRUCTURE_TYPE_structure", "TOLL_POINT_TYPE_toll_point",
+    "UNDERPASS_TYPE_underpass", "FROM_JCT", "TO_JCT", "LENGTH", "ACCURACY", "NID", "DIRECTION",
+    "EXIT_NUM", "ELEM_TYPE", "TOLL_ROAD", "ACQTECH", "CREDATE", "REVDATE", "GEO_UPD_DT", "EFF_DATE",
+]
+road_links_df = road_network_gdf.reindex(columns=road_link_columns)
+
+road_groups = road_links_df.groupby("FULL_STREET_NAME_road_names")
 jurisdiction_dict = {}
 
 for road_name, group in road_groups:
     if pd.isna(road_name):
         continue
 
-    road_uri = CDT[f"road_{id}"]
-    id += 1
+    road_uri = CDT[f"road_{road_ids[road_name]}"]
     road_links = []  # Store all road link URIs for a given road
 
-    for _, row in group.iterrows():
-        road_id = row["OGF_ID"]
-        road_geometry = row["geometry"].wkt  # Convert geometry to WKT
+    # The triples of the road and its links are written in one batch
+    triples = []
+    add = triples.append
 
-        # Ensure Roads are within Toronto bounds
-        if not (toronto_bounds["lat_min"] <= row.geometry.bounds[1] <= toronto_bounds["lat_max"] and
-                toronto_bounds["lon_min"] <= row.geometry.bounds[0] <= toronto_bounds["lon_max"]):
-            continue
+    for row in group.itertuples(index=False):
+        road_id = row.OGF_ID
 
         # Extract metadata
-        speed_limit = row.get("SPEED_LIMIT_speed_limits")
-        road_class = row.get("ROAD_CLASS_road_classes")
-        road_name = row.get("FULL_STREET_NAME_road_names")
-        blocked_passage = row.get("BLOCKED_PASSAGE_TYPE_blocked_passage")
-        jurisdiction = row.get("JURISDICTION_jurisdiction")
-        num_lanes = row.get("NUMBER_OF_LANES_num_lanes")
-        pavement_status = row.get("PAVEMENT_STATUS_road_surface")
-        surface_type = row.get("SURFACE_TYPE_road_surface")
-        route_name = row.get("ROUTE_NAME_ENGLISH_route_name")
-        route_number = row.get("ROUTE_NUMBER_route_number")
-        structure_type = row.get("STRUCTURE_TYPE_structure")
-        toll_point_type = row.get("TOLL_POINT_TYPE_toll_point")
-        underpass_type = row.get("UNDERPASS_TYPE_underpass")
+        speed_limit = row.SPEED_LIMIT_speed_limits
+        road_class = row.ROAD_CLASS_road_classes
+        road_name = row.FULL_STREET_NAME_road_names
+        blocked_passage = row.BLOCKED_PASSAGE_TYPE_blocked_passage
+        jurisdiction = row.JURISDICTION_jurisdiction
+        num_lanes = row.NUMBER_OF_LANES_num_lanes
+        pavement_status = row.PAVEMENT_STATUS_road_surface
+        surface_type = row.SURFACE_TYPE_road_surface
+        route_name = row.ROUTE_NAME_ENGLISH_route_name
+        route_number = row.ROUTE_NUMBER_route_number
+        structure_type = row.STRUCTURE_TYPE_structure
+        toll_point_type = row.TOLL_POINT_TYPE_toll_point
+        underpass_type = row.UNDERPASS_TYPE_underpass
 
         # Junction IDs
-        from_junction_id = row.get("FROM_JCT")  # Junction at the start of the road_link
-        to_junction_id = row.get("TO_JCT")  # Junction at the end of the road_link
-
-        length = row.get("LENGTH")
-        accuracy = row.get("ACCURACY")
-        nid = row.get("NID")
-        direction = row.get("DIRECTION")
-        exit_num = row.get("EXIT_NUM")
-        elem_type = row.get("ELEM_TYPE")
-        toll_road = row.get("TOLL_ROAD")
-        acqtech = row.get("ACQTECH")
-        credate = row.get("CREDATE")
-        revdate = row.get("REVDATE")
-        geo_upd_dt = row.get("GEO_UPDATE_DT")
-        eff_date = row.get("EFF_DATE")
+        from_junction_id = row.FROM_JCT  # Junction at the start of the road_link
+        to_junction_id = row.TO_JCT  # Junction at the end of the road_link
+
+        length = row.LENGTH
+        accuracy = row.ACCURACY
+        nid = row.NID
+        direction = row.DIRECTION
+        exit_num = row.EXIT_NUM
+        elem_type = row.ELEM_TYPE
+        toll_road = row.TOLL_ROAD
+        acqtech = row.ACQTECH
 
         # Create URIs
-        location_uri = GEO_LOC[f"location_{road_id}"]
-        road_link_uri = CDT[f"roadLink_{road_id}"]
-        road_user_uri = INFRAS[f"roadLinkUser_{road_id}"]
+        location_uri = GEO_LOC[row.LOCATION_NAME]
+        road_link_uri = CDT[row.ROAD_LINK_NAME]
+        road_user_uri = INFRAS[row.ROAD_USER_NAME]
 
         road_links.append(road_link_uri)  # Collect all road links for the road
 
         # RoadLink
-        g.add((road_link_uri, RDF.type, CDT.RoadLink))
-        g.add((CDT.RoadLink, RDFS.subClassOf, INFRAS.RoadLink))
-        g.add((INFRAS.RoadLink, RDFS.subClassOf, TRANSPORT.TravelledWayLink))
-        g.add((TRANSPORT.TravelledWayLink, RDFS.subClassOf, INFRASTRUCTURE.InfrastructureElement))
-        g.add((road_link_uri, PARTWHOLE.properPartOf, road_uri))
-        g.add((road_link_uri, ROAD.usedBy, road_user_uri))
-        g.add((road_user_uri, ROAD.uses, road_link_uri))
-        g.add((road_link_uri, GEN.hasIdentifier, Literal(str(road_id), datatype=XSD.string)))
+        add((road_link_uri, RDF.type, CDT.RoadLink))
+        add((road_link_uri, PARTWHOLE.properPartOf, road_uri))
+        add((road_link_uri, ROAD.usedBy, road_user_uri))
+        add((road_user_uri, ROAD.uses, road_link_uri))
+        add((road_link_uri, GEN.hasIdentifier, Literal(str(road_id), datatype=XSD.string)))
 
         if elem_type == "Virtual Road": # Filters all Virtual Roads
             continue
@@ -285,207 +331,201 @@ for road_name, group in road_groups:
             speed_unit_uri = CITYUNITS[f"speedUnit_{road_id}"]
             speed_measure = CITYUNITS[f"speedMeasure_{road_id}"]
 
-            g.add((speed_measure, RDF.type, CITYUNITS.Measure))
-            g.add((speed_uri, RDF.type, CITYUNITS.Speed))
-            g.add((speed_unit_uri, RDF.type, I72.kilometersPerHr))
+            add((speed_measure, RDF.type, CITYUNITS.Measure))
+            add((speed_uri, RDF.type, CITYUNITS.Speed))
+            add((speed_unit_uri, RDF.type, I72.kilometersPerHr))
 
-            g.add((CITYUNITS.Speed, RDFS.subClassOf, I72.Quantity))
-            g.add((speed_uri, I72.value, speed_measure))
+            add((speed_uri, I72.value, speed_measure))
 
-            g.add((speed_measure, I72.unit_of_measure, speed_unit_uri))
-            g.add((speed_measure, I72.numerical_value, Literal(int(speed_limit), datatype=XSD.integer)))
+            add((speed_measure, I72.unit_of_measure, speed_unit_uri))
+            add((speed_measure, I72.numerical_value, Literal(int(speed_limit), datatype=XSD.integer)))
 
-            g.add((road_user_uri, ROAD.speedLimit, speed_uri))
+            add((road_user_uri, ROAD.speedLimit, speed_uri))
 
         if pd.notna(length):
             length_measurement = CITYUNITS[f"length_{road_id}"]
             length_unit_uri = CITYUNITS[f"lengthUnit_{road_id}"]
             length_measure = CITYUNITS[f"lengthMeasure_{road_id}"]
 
-            g.add((length_measure, RDF.type, CITYUNITS.Measure))
-            g.add((length_measurement, RDF.type, CITYUNITS.Length))
-            g.add((length_unit_uri, RDF.type, I72.Meters))
+            add((length_measure, RDF.type, CITYUNITS.Measure))
+            add((length_measurement, RDF.type, CITYUNITS.Length))
+            add((length_unit_uri, RDF.type, I72.Meters))
 
-            g.add((CITYUNITS.Length, RDFS.subClassOf, I72.Quantity))
-            g.add((length_measurement, I72.value, length_measure))
+            add((length_measurement, I72.value, length_measure))
 
-            g.add((length_measure, I72.unit_of_measure, length_unit_uri))
-            g.add((length_measure, I72.numerical_value, Literal(int(length), datatype=XSD.decimal)))
+            add((length_measure, I72.unit_of_measure, length_unit_uri))
+            add((length_measure, I72.numerical_value, Literal(int(length), datatype=XSD.decimal)))
 
-            g.add((road_link_uri, CDT.length, length_measurement))
+            add((road_link_uri, CDT.length, length_measurement))
 
         if pd.notna(accuracy):
             accuracy_measurement = CITYUNITS[f"accuracy_{road_id}"]
             accuracy_unit_uri = CITYUNITS[f"accuracyUnit_{road_id}"]
             accuracy_measure = CITYUNITS[f"accuracyMeasure_{road_id}"]
 
-            g.add((accuracy_measure, RDF.type, CITYUNITS.Measure))
-            g.add((accuracy_measurement, RDF.type, CITYUNITS.Length))
-            g.add((accuracy_unit_uri, RDF.type, I72.Meters))
+            add((accuracy_measure, RDF.type, CITYUNITS.Measure))
+            add((accuracy_measurement, RDF.type, CITYUNITS.Length))
+            add((accuracy_unit_uri, RDF.type, I72.Meters))
 
-            g.add((CITYUNITS.Length, RDFS.subClassOf, I72.Quantity))
-            g.add((accuracy_measurement, I72.value, accuracy_measure))
+            add((accuracy_measurement, I72.value, accuracy_measure))
 
-            g.add((accuracy_measure, I72.unit_of_measure, accuracy_unit_uri))
-            g.add((accuracy_measure, I72.numerical_value, Literal(int(accuracy), datatype=XSD.decimal)))
+            add((accuracy_measure, I72.unit_of_measure, accuracy_unit_uri))
+            add((accuracy_measure, I72.numerical_value, Literal(int(accuracy), datatype=XSD.decimal)))
 
-            g.add((road_link_uri, CDT.roadAbsoluteAccuracy, accuracy_measurement))
+            add((road_link_uri, CDT.roadAbsoluteAccuracy, accuracy_measurement))
 
         if pd.notna(nid):
-            g.add((road_link_uri, CDT.nationUUID, Literal(nid, datatype=XSD.string)))
+            add((road_link_uri, CDT.nationUUID, Literal(nid, datatype=XSD.string)))
 
         if pd.notna(surface_type):
             surface_type_measurement = CDT[f"surface_type_{road_id}"]
             surface_Code = CODE[f"surfaceType_Code_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasSurfaceType, surface_type_measurement))
-            g.add((surface_type_measurement, RDF.type, CDT.SurfaceType))
-            g.add((surface_type_measurement, CODE.hasCode, surface_Code))
-            g.add((surface_Code, RDF.type, CODE.Code))
-            g.add((surface_Code, GEN.hasName, Literal(surface_type, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasSurfaceType, surface_type_measurement))
+            add((surface_type_measurement, RDF.type, CDT.SurfaceType))
+            add((surface_type_measurement, CODE.hasCode, surface_Code))
+            add((surface_Code, RDF.type, CODE.Code))
+            add((surface_Code, GEN.hasName, Literal(surface_type, datatype=XSD.string)))
 
         if pd.notna(direction): # *** Need to be Link Directions
             if direction == "Positive":
-                g.add((road_link_uri, TRANSPORT.allowedDirections, CDT.Forward))
+                add((road_link_uri, TRANSPORT.allowedDirections, CDT.Forward))
             elif direction == "Negative":
-                g.add((road_link_uri, TRANSPORT.allowedDirections, CDT.Reverse))
+                add((road_link_uri, TRANSPORT.allowedDirections, CDT.Reverse))
             else:
-                g.add((road_link_uri, TRANSPORT.allowedDirections, CDT.Bidirectional))
+                add((road_link_uri, TRANSPORT.allowedDirections, CDT.Bidirectional))
 
         if pd.notna(exit_num):
-            g.add((road_link_uri, CDT.exitNum, Literal(exit_num, datatype=XSD.string)))
+            add((road_link_uri, CDT.exitNum, Literal(exit_num, datatype=XSD.string)))
 
         if pd.notna(toll_road):
             if toll_road == "Yes":
-                g.add((road_link_uri, CDT.tollRoad, Literal('true', datatype=XSD.boolean)))
+                add((road_link_uri, CDT.tollRoad, Literal('true', datatype=XSD.boolean)))
             else:
-                g.add((road_link_uri, CDT.tollRoad, Literal('false', datatype=XSD.boolean)))
+                add((road_link_uri, CDT.tollRoad, Literal('false', datatype=XSD.boolean)))
 
         if pd.notna(acqtech):
             acqtech_measurement = CDT[f"acqtech_{road_id}"]
             acqtech_Code = CODE[f"acqtechCode_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasAquisitionTechnique, acqtech_measurement))
-            g.add((acqtech_measurement, RDF.type, CDT.AquisitionTechnique))
-            g.add((acqtech_measurement, CODE.hasCode, acqtech_Code))
-            g.add((acqtech_Code, RDF.type, CODE.Code))
-            g.add((acqtech_Code, GEN.hasName, Literal(acqtech, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasAquisitionTechnique, acqtech_measurement))
+            add((acqtech_measurement, RDF.type, CDT.AquisitionTechnique))
+            add((acqtech_measurement, CODE.hasCode, acqtech_Code))
+            add((acqtech_Code, RDF.type, CODE.Code))
+            add((acqtech_Code, GEN.hasName, Literal(acqtech, datatype=XSD.string)))
 
         if pd.notna(road_class):
             road_class_uri = CDT[f"roadClass_{road_id}"]
             codeRoadClass_uri = CDT[f"roadClass_Code_{road_id}"]
 
-            g.add((road_link_uri, CDT.roadClass, road_class_uri))
-            g.add((road_class_uri, RDF.type, CDT.RoadClass))
-            g.add((road_class_uri, CODE.hasCode, codeRoadClass_uri))
-            g.add((codeRoadClass_uri, RDF.type, CODE.Code))
-            g.add((codeRoadClass_uri, GEN.hasName, Literal(road_class, datatype=XSD.string)))
+            add((road_link_uri, CDT.roadClass, road_class_uri))
+            add((road_class_uri, RDF.type, CDT.RoadClass))
+            add((road_class_uri, CODE.hasCode, codeRoadClass_uri))
+            add((codeRoadClass_uri, RDF.type, CODE.Code))
+            add((codeRoadClass_uri, GEN.hasName, Literal(road_class, datatype=XSD.string)))
 
         if pd.notna(road_name):
-            g.add((road_link_uri, GEN.hasName, Literal(road_name, datatype=XSD.string)))
+            add((road_link_uri, GEN.hasName, Literal(road_name, datatype=XSD.string)))
 
         if pd.notna(blocked_passage):
             blocked_uri = CDT[f"blockedPassage_{road_id}"]
             blocked_code = CDT[f"blockedPassage_Code_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasBlockedPassage, blocked_uri))
-            g.add((blocked_uri, RDF.type, CDT.BlockedPassageType))
-            g.add((blocked_uri, CODE.hasCode, blocked_code))
-            g.add((blocked_code, RDF.type, CODE.Code))
-            g.add((blocked_code, GEN.hasName, Literal(blocked_passage, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasBlockedPassage, blocked_uri))
+            add((blocked_uri, RDF.type, CDT.BlockedPassageType))
+            add((blocked_uri, CODE.hasCode, blocked_code))
+            add((blocked_code, RDF.type, CODE.Code))
+            add((blocked_code, GEN.hasName, Literal(blocked_passage, datatype=XSD.string)))
 
         if pd.notna(jurisdiction):
             gov_org_uri = ORG[f"govOrg_{road_id}"]
 
-            g.add((ORG.GovernmentOrganization, RDFS.subClassOf, ORG.Organization))
-            g.add((gov_org_uri, RDF.type, ORG.GovernmentOrganization))
+            add((gov_org_uri, RDF.type, ORG.GovernmentOrganization))
 
-            g.add((gov_org_uri, CDT.responsibleFor, road_link_uri))
-            g.add((road_link_uri, CDT.hasCustodian, gov_org_uri))
+            add((gov_org_uri, CDT.responsibleFor, road_link_uri))
+            add((road_link_uri, CDT.hasCustodian, gov_org_uri))
 
         if pd.notna(num_lanes):
-            g.add((road_link_uri, ROAD.numLanes, Literal(int(num_lanes), datatype=XSD.integer)))
+            add((road_link_uri, ROAD.numLanes, Literal(int(num_lanes), datatype=XSD.integer)))
 
         if pd.notna(pavement_status):
             if pavement_status == "Paved":
-                g.add((road_link_uri, CDT.pavementStatus, Literal("true", datatype=XSD.boolean)))
+                add((road_link_uri, CDT.pavementStatus, Literal("true", datatype=XSD.boolean)))
             else:
-                g.add((road_link_uri, CDT.pavementStatus, Literal("false", datatype=XSD.boolean)))
+                add((road_link_uri, CDT.pavementStatus, Literal("false", datatype=XSD.boolean)))
 
         if pd.notna(route_name):
-            g.add((road_link_uri, CDT.routeName, Literal(route_name, datatype=XSD.string)))
+            add((road_link_uri, CDT.routeName, Literal(route_name, datatype=XSD.string)))
 
         if pd.notna(route_number): # Some are Alpha Numeric Values
-            g.add((road_link_uri, CDT.routeNumber, Literal(str(route_number), datatype=XSD.string)))
+            add((road_link_uri, CDT.routeNumber, Literal(str(route_number), datatype=XSD.string)))
 
         if pd.notna(structure_type):
             structure_type_measurement = CDT[f"structure_type_{road_id}"]
             structure_type_Code = CODE[f"structureTypeCode_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasStructureType, structure_type_measurement))
-            g.add((structure_type_measurement, RDF.type, CDT.StructureType))
-            g.add((structure_type_measurement, CODE.hasCode, structure_type_Code))
-            g.add((structure_type_Code, RDF.type, CODE.Code))
-            g.add((structure_type_Code, GEN.hasName, Literal(structure_type, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasStructureType, structure_type_measurement))
+            add((structure_type_measurement, RDF.type, CDT.StructureType))
+            add((structure_type_measurement, CODE.hasCode, structure_type_Code))
+            add((structure_type_Code, RDF.type, CODE.Code))
+            add((structure_type_Code, GEN.hasName, Literal(structure_type, datatype=XSD.string)))
 
         if pd.notna(toll_point_type):
             toll_type_measurement = CDT[f"tollPoint_type_{road_id}"]
             toll_type_Code = CODE[f"tollTypeCode_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasTollPointType, toll_type_measurement))
-            g.add((toll_type_measurement, RDF.type, CDT.TollPointType))
-            g.add((toll_type_measurement, CODE.hasCode, toll_type_Code))
-            g.add((toll_type_Code, RDF.type, CODE.Code))
-            g.add((toll_type_Code, GEN.hasName, Literal(toll_point_type, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasTollPointType, toll_type_measurement))
+            add((toll_type_measurement, RDF.type, CDT.TollPointType))
+            add((toll_type_measurement, CODE.hasCode, toll_type_Code))
+            add((toll_type_Code, RDF.type, CODE.Code))
+            add((toll_type_Code, GEN.hasName, Literal(toll_point_type, datatype=XSD.string)))
 
         if pd.notna(underpass_type):
             underpass_type_measurement = CDT[f"underpass_type_{road_id}"]
             underpass_type_Code = CODE[f"underpassTypeCode_{road_id}"]
 
-            g.add((road_link_uri, CDT.hasUnderpassType, underpass_type_measurement))
-            g.add((underpass_type_measurement, RDF.type, CDT.UnderpassType))
-            g.add((underpass_type_measurement, CODE.hasCode, underpass_type_Code))
-            g.add((underpass_type_Code, RDF.type, CODE.Code))
-            g.add((underpass_type_Code, GEN.hasName, Literal(underpass_type, datatype=XSD.string)))
+            add((road_link_uri, CDT.hasUnderpassType, underpass_type_measurement))
+            add((underpass_type_measurement, RDF.type, CDT.UnderpassType))
+            add((underpass_type_measurement, CODE.hasCode, underpass_type_Code))
+            add((underpass_type_Code, RDF.type, CODE.Code))
+            add((underpass_type_Code, GEN.hasName, Literal(underpass_type, datatype=XSD.string)))
 
 
         # Add Junction relationships
         if pd.notna(from_junction_id):
             from_junction_uri = CDT[f"junction_{from_junction_id}"]
-            g.add((road_link_uri, TRANSPORT["from"], from_junction_uri))
-            g.add((from_junction_uri, TRANSPORT.egress, road_link_uri))
+            add((road_link_uri, TRANSPORT["from"], from_junction_uri))
+            add((from_junction_uri, TRANSPORT.egress, road_link_uri))
 
         if pd.notna(to_junction_id):
             to_junction_uri = CDT[f"junction_{to_junction_id}"]
-            g.add((road_link_uri, TRANSPORT.to, to_junction_uri))
-            g.add((to_junction_uri, TRANSPORT.ingress, road_link_uri))
+            add((road_link_uri, TRANSPORT.to, to_junction_uri))
+            add((to_junction_uri, TRANSPORT.ingress, road_link_uri))
 
         # Convert and add Date Fields
         for date_field, predicate in [("CREDATE", CDT.creationDate),
                                       ("REVDATE", CDT.revisionDate),
                                       ("GEO_UPD_DT", CDT.geoUpdateDate),
                                       ("EFF_DATE", CDT.effectiveDate)]:
-            formatted_date = format_date(row.get(date_field))
+            formatted_date = format_date(getattr(row, date_field))
             if formatted_date:
-                g.add((road_link_uri, predicate, Literal(formatted_date, datatype=XSD.date)))
+                add((road_link_uri, predicate, Literal(formatted_date, datatype=XSD.date)))
 
         # Geolocation
-        g.add((location_uri, RDF.type, GEO_LOC.Location))
-        g.add((GEO_LOC.Location, RDFS.subClassOf, GEO.Geometry))
-        g.add((location_uri, GEO.asWKT, Literal(row["geometry"].wkt, datatype=GEO.wktLiteral)))
-        g.add((road_link_uri, GEO_LOC.hasLocation, location_uri))
+        add((location_uri, RDF.type, GEO_LOC.Location))
+        add((location_uri, GEO.asWKT, Literal(row.WKT, datatype=GEO.wktLiteral)))
+        add((road_link_uri, GEO_LOC.hasLocation, location_uri))
 
     # Creates the Road entity and adds all RoadLinks as part of the Road entity
     if road_links:
-        g.add((CDT.Road, RDFS.subClassOf, INFRAS.Road))
-        g.add((road_uri, RDF.type, CDT.Road))
-        g.add((road_uri, GEN.hasName, Literal(road_name, datatype=XSD.string)))
+        add((road_uri, RDF.type, CDT.Road))
+        add((road_uri, GEN.hasName, Literal(road_name, datatype=XSD.string)))
         for road_link in road_links:
-            g.add((road_uri, PARTWHOLE.hasProperPart, road_link))
-        id += 1
+            add((road_uri, PARTWHOLE.hasProperPart, road_link))
 
-# Write RDF Data to Turtle File
-output_file = "toronto_roads.ttl"
-g.serialize(destination=output_file, format="turtle")
+    g.add_many(triples)
+
+# Close the Turtle file
+g.close()
 
-print(f"Written to {output_file}")
+print(f"Written {g.count} triples to {output_file}")
@@ -0,0 +1,110 @@
+"""
+Time the row access of Toronto_Roads.py on the ORN shapefile and junction table.
+
+Compares checking the Toronto bounds, reading the fields and building the URI
+names of every road link and junction row by row with iterrows(), as
+Toronto_Roads.py used to, against filtering with a vectorized bounds mask and
+iterating pre-selected columns with itertuples() and NumPy arrays, with the URI
+names and WKT strings built column-wise, as it does now.
+"""
+
+import time
+import geopandas as gpd
+import pandas as pd
+import shapely
+
+REPEAT = 3
+
+# Fields read from each road link by Toronto_Roads.py
+LINK_FIELDS = ["FROM_JCT", "TO_JCT", "LENGTH", "ACCURACY", "NID", "DIRECTION", "EXIT_NUM",
+               "ELEM_TYPE", "TOLL_ROAD", "ACQTECH", "CREDATE", "REVDATE", "GEO_UPD_DT", "EFF_DATE"]
+JUNCTION_FIELDS = ["JUNCTION_ID", "LATITUDE_DECIMAL_DEGREES", "LONGITUDE_DECIMAL_DEGREES", "JUNCTION_TYPE",
+                   "EXIT_NUMBER", "NATIONAL_UUID", "EFFECTIVE_DATETIME"]
+# Fields read from each junction in the loop once the Toronto filter is applied as a mask
+JUNCTION_ROW_FIELDS = ["JUNCTION_ID", "JUNCTION_TYPE", "EXIT_NUMBER", "NATIONAL_UUID", "EFFECTIVE_DATETIME"]
+
+TORONTO_BOUNDS = {
+    "lat_min": 43.5810,
+    "lat_max": 43.8555,
+    "lon_min": -79.6393,
+    "lon_max": -79.1152,
+}
+
+
+def best_time(function):
+    """Return the best of REPEAT runs of function, in seconds."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def links_iterrows(gdf):
+    for _, row in gdf.iterrows():
+        if not (TORONTO_BOUNDS["lat_min"] <= row.geometry.bounds[1] <= TORONTO_BOUNDS["lat_max"] and
+                TORONTO_BOUNDS["lon_min"] <= row.geometry.bounds[0] <= TORONTO_BOUNDS["lon_max"]):
+            continue
+        road_id = row["OGF_ID"]
+        fields = [row.get(field) for field in LINK_FIELDS]
+        names = (f"location_{road_id}", f"roadLink_{road_id}", f"roadLinkUser_{road_id}")
+        wkt = row["geometry"].wkt
+
+
+def links_columnar(gdf):
+    bounds = gdf.bounds
+    gdf = gdf[bounds["miny"].between(TORONTO_BOUNDS["lat_min"], TORONTO_BOUNDS["lat_max"]) &
+              bounds["minx"].between(TORONTO_BOUNDS["lon_min"], TORONTO_BOUNDS["lon_max"])]
+    gdf = gdf.assign(
+        ROAD_LINK_NAME="roadLink_" + gdf["OGF_ID"],
+        LOCATION_NAME="location_" + gdf["OGF_ID"],
+        ROAD_USER_NAME="roadLinkUser_" + gdf["OGF_ID"],
+        WKT=shapely.to_wkt(gdf.geometry.to_numpy(), rounding_precision=-1),
+    )
+    columns = gdf.reindex(columns=["OGF_ID", "ROAD_LINK_NAME", "LOCATION_NAME", "ROAD_USER_NAME", "WKT"] + LINK_FIELDS)
+    for row in columns.itertuples(index=False):
+        road_id = row.OGF_ID
+        fields = [getattr(row, field) for field in LINK_FIELDS]
+        names = (row.LOCATION_NAME, row.ROAD_LINK_NAME, row.ROAD_USER_NAME)
+        wkt = row.WKT
+
+
+def junctions_iterrows(df):
+    for _, row in df.iterrows():
+        fields = [row[field] for field in JUNCTION_FIELDS]
+        latitude = row["LATITUDE_DECIMAL_DEGREES"]
+        longitude = row["LONGITUDE_DECIMAL_DEGREES"]
+        if not (TORONTO_BOUNDS["lat_min"] <= latitude <= TORONTO_BOUNDS["lat_max"] and
+                TORONTO_BOUNDS["lon_min"] <= longitude <= TORONTO_BOUNDS["lon_max"]):
+            continue
+        junction_id = row["JUNCTION_ID"]
+        names = (f"junction_{junction_id}", f"junction_loc_{junction_id}",
+                 f"junction_type_{junction_id}", f"junctionType_Code{junction_id}")
+        wkt = f"POINT ({longitude} {latitude})"
+
+
+def junctions_columnar(df):
+    df = df[df["LATITUDE_DECIMAL_DEGREES"].between(TORONTO_BOUNDS["lat_min"], TORONTO_BOUNDS["lat_max"]) &
+            df["LONGITUDE_DECIMAL_DEGREES"].between(TORONTO_BOUNDS["lon_min"], TORONTO_BOUNDS["lon_max"])]
+    ids = df["JUNCTION_ID"].astype(str)
+    wkts = "POINT (" + df["LONGITUDE_DECIMAL_DEGREES"].astype(str) + " " + df["LATITUDE_DECIMAL_DEGREES"].astype(str) + ")"
+    for fields in zip(*(df[field].to_numpy() for field in JUNCTION_ROW_FIELDS),
+                      ("junction_" + ids).to_numpy(), ("junction_loc_" + ids).to_numpy(),
+                      ("junction_type_" + ids).to_numpy(), ("junctionType_Code" + ids).to_numpy(),
+                      wkts.to_numpy()):
+        pass
+
+
+road_network_gdf = gpd.read_file("ORN_ROAD_NET_ELEMENT.shp")
+road_network_gdf["OGF_ID"] = road_network_gdf["OGF_ID"].astype(str)
+junctions_df = pd.read_csv("ORN_JUNCTION.csv", delimiter=";")
+
+for label, rows, before, after in [
+    ("road links", road_network_gdf, links_iterrows, links_columnar),
+    ("junctions", junctions_df, junctions_iterrows, junctions_columnar),
+]:
+    before_time = best_time(lambda: before(rows))
+    after_time = best_time(lambda: after(rows))
+    print(f"{label} ({len(rows)} rows): iterrows {before_time:.3f} s, "
+          f"columnar {after_time:.3f} s, {before_time / after_time:.1f}x faster")
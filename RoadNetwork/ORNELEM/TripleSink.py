@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+TripleSink.py
+
+Description: This is a Python module that writes RDF triples to disk as they
+are generated, instead of holding them in an rdflib Graph until it is
+serialized. The triples are written as N-Triples, one per line. N-Triples is a
+subset of Turtle, so the output can keep the .ttl extension.
+
+Only the schema triples, which the programs repeat, are kept in memory to
+write each of them once. Instance triples are written as they come, so a
+triple generated twice is written twice, which does not change the graph it
+is loaded into.
+
+This is a copy of OpenStreetMap/TripleSink.py, kept next to Toronto_Roads.py so
+the road network script can import it from its own directory. Changes to one
+should be made to both.
+
+"""
+
+# Import modules
+from rdflib import URIRef, Literal
+
+# Characters escaped in an N-Triples literal
+escapes = str.maketrans({"\\": "\\\\", "\"": "\\\"", "\n": "\\n", "\r": "\\r"})
+
+
+def nt_term(term):
+    """
+    Converts an RDF term to its N-Triples form.
+
+    Parameters:
+    term (rdflib.term.Node): A URIRef, Literal or BNode.
+
+    Returns:
+    str: The term in N-Triples syntax.
+    """
+
+    # Format the terms as plain strings, since adding a str to a URIRef
+    # creates a new URIRef
+    if type(term) is URIRef:
+        return f"<{term}>"
+    if isinstance(term, Literal):
+        value = str(term).translate(escapes)
+        if term.language is not None:
+            return f"\"{value}\"@{term.language}"
+        if term.datatype is not None:
+            return f"\"{value}\"^^<{term.datatype}>"
+        return f"\"{value}\""
+    if isinstance(term, URIRef):
+        return f"<{term}>"
+    return f"_:{term}"
+
+
+class TripleSink:
+    """
+    Append-only N-Triples writer with the add method of an rdflib Graph.
+
+    Parameters:
+    filename (str): The file the triples are written to.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self.file = open(filename, "w", encoding='utf8', buffering=1 << 20)
+        self.write = self.file.write
+        self.schema = set()
+        self.count = 0
+
+    def add(self, triple):
+        """
+        Writes an instance triple.
+
+        Parameters:
+        triple (tuple): The (subject, predicate, object) triple.
+        """
+
+        subject, predicate, value = triple
+        self.write(f"{nt_term(subject)} {nt_term(predicate)} {nt_term(value)} .\n")
+        self.count += 1
+
+    def add_many(self, triples):
+        """
+        Writes a batch of instance triples with one call to the file.
+
+        Parameters:
+        triples (list): The (subject, predicate, object) triples.
+        """
+
+        self.write("".join([f"{nt_term(s)} {nt_term(p)} {nt_term(o)} .\n" for s, p, o in triples]))
+        self.count += len(triples)
+
+    def add_schema(self, triple):
+        """
+        Writes a schema triple, unless it was written before.
+
+        Parameters:
+        triple (tuple): The (subject, predicate, object) triple.
+        """
+
+        if triple not in self.schema:
+            self.schema.add(triple)
+            self.add(triple)
+
+    def close(self):
+        """
+        Flushes and closes the file.
+        """
+
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()